@@ -0,0 +1,279 @@
+"""
+Chrome DevTools Protocol(CDP)로 헤드리스 Chrome을 직접 제어하는 모듈
+chromedriver를 거치지 않고 웹소켓 하나로 명령을 보내며,
+폴링 대신 페이지/네트워크 이벤트로 로딩 완료를 기다립니다.
+"""
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import urllib.request
+from collections import deque
+from typing import Dict, List, Optional
+
+try:
+    import websocket  # websocket-client
+except ImportError:
+    websocket = None
+
+# Chrome 실행 파일 후보 (CHROME_BINARY가 없을 때 PATH에서 검색)
+CHROME_CANDIDATES = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+]
+
+
+class CDPError(RuntimeError):
+    """CDP 명령 실패 또는 대기 시간 초과"""
+
+
+def find_chrome_binary(preferred: str = "") -> str:
+    """Chrome 실행 파일 경로를 찾습니다."""
+    if preferred:
+        return preferred
+    for name in CHROME_CANDIDATES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise CDPError("Chrome 실행 파일을 찾을 수 없습니다. CHROME_BINARY를 설정하세요.")
+
+
+class CDPBrowser:
+    """
+    헤드리스 Chrome 프로세스 하나와 페이지 타깃 하나를 CDP로 제어하는 클래스
+
+    with 문으로 사용하면 종료 시 브라우저와 임시 프로필을 정리합니다.
+    """
+
+    def __init__(self, chrome_args: Optional[List[str]] = None, headless: bool = True,
+                 binary: str = "", timeout: float = 60):
+        if websocket is None:
+            raise CDPError("CDP 백엔드를 사용하려면 websocket-client 패키지가 필요합니다.")
+        self.chrome_args = chrome_args or []
+        self.headless = headless
+        self.binary = binary
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.ws = None
+        self._profile_dir: Optional[str] = None
+        self._next_id = 0
+        self._events = deque(maxlen=1000)
+        self._inflight = set()
+        self._last_network_activity = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # 브라우저 실행/종료
+    # ------------------------------------------------------------------
+    def __enter__(self) -> "CDPBrowser":
+        self.launch()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def launch(self):
+        """Chrome을 원격 디버깅 모드로 실행하고 페이지 웹소켓에 연결합니다."""
+        self._profile_dir = tempfile.mkdtemp(prefix="today-menu-cdp-")
+        args = [
+            find_chrome_binary(self.binary),
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self._profile_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ]
+        if self.headless:
+            args.append("--headless=new")
+        args.extend(self.chrome_args)
+        args.append("about:blank")
+        self.process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        port = self._wait_for_port()
+        ws_url = self._page_websocket_url(port)
+        self.ws = websocket.create_connection(ws_url, timeout=self.timeout, suppress_origin=True)
+
+        self.send("Page.enable")
+        self.send("Network.enable")
+        self.send("Runtime.enable")
+
+    def _wait_for_port(self) -> int:
+        """Chrome이 프로필 디렉터리에 기록하는 DevToolsActivePort 파일에서 포트를 읽습니다."""
+        port_file = os.path.join(self._profile_dir, "DevToolsActivePort")
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CDPError(f"Chrome이 시작 직후 종료되었습니다 (exit code {self.process.returncode})")
+            try:
+                with open(port_file, encoding="utf-8") as f:
+                    first_line = f.readline().strip()
+                if first_line:
+                    return int(first_line)
+            except (OSError, ValueError):
+                pass
+            time.sleep(0.05)
+        raise CDPError("Chrome 원격 디버깅 포트를 확인하지 못했습니다.")
+
+    def _page_websocket_url(self, port: int) -> str:
+        """열려 있는 페이지 타깃의 웹소켓 주소를 가져옵니다."""
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/list", timeout=self.timeout) as response:
+            targets = json.loads(response.read().decode("utf-8"))
+        for target in targets:
+            if target.get("type") == "page" and target.get("webSocketDebuggerUrl"):
+                return target["webSocketDebuggerUrl"]
+        raise CDPError("CDP 페이지 타깃을 찾지 못했습니다.")
+
+    def close(self):
+        """브라우저를 종료하고 임시 프로필을 삭제합니다."""
+        if self.ws is not None:
+            try:
+                self.ws.close()
+            except Exception:
+                pass  # 이미 끊긴 경우 무시
+            self.ws = None
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        if self._profile_dir:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+    # ------------------------------------------------------------------
+    # 메시지 송수신
+    # ------------------------------------------------------------------
+    def _recv(self, timeout: float) -> Dict[str, any]:
+        """메시지 하나를 받고, 이벤트이면 네트워크 상태를 갱신합니다."""
+        self.ws.settimeout(max(timeout, 0.01))
+        message = json.loads(self.ws.recv())
+        method = message.get("method")
+        if method:
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                self._inflight.add(params.get("requestId"))
+                self._last_network_activity = time.monotonic()
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                self._inflight.discard(params.get("requestId"))
+                self._last_network_activity = time.monotonic()
+        return message
+
+    def send(self, method: str, params: Optional[Dict[str, any]] = None,
+             timeout: Optional[float] = None) -> Dict[str, any]:
+        """
+        CDP 명령을 보내고 결과를 기다립니다.
+        응답을 기다리는 동안 도착한 이벤트는 큐에 보관합니다.
+        """
+        self._next_id += 1
+        command_id = self._next_id
+        self.ws.send(json.dumps({"id": command_id, "method": method, "params": params or {}}))
+
+        deadline = time.monotonic() + (timeout or self.timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CDPError(f"CDP 응답 시간 초과: {method}")
+            try:
+                message = self._recv(remaining)
+            except websocket.WebSocketTimeoutException:
+                continue
+            if message.get("id") == command_id:
+                if "error" in message:
+                    raise CDPError(f"CDP 명령 실패 ({method}): {message['error'].get('message')}")
+                return message.get("result", {})
+            if "method" in message:
+                self._events.append(message)
+
+    def wait_for_event(self, method: str, timeout: Optional[float] = None) -> Dict[str, any]:
+        """특정 이벤트가 도착할 때까지 기다립니다 (폴링 없음)."""
+        for i, event in enumerate(self._events):
+            if event["method"] == method:
+                del self._events[i]
+                return event.get("params", {})
+
+        deadline = time.monotonic() + (timeout or self.timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CDPError(f"이벤트 대기 시간 초과: {method}")
+            try:
+                message = self._recv(remaining)
+            except websocket.WebSocketTimeoutException:
+                continue
+            if message.get("method") == method:
+                return message.get("params", {})
+
+    def wait_for_network_idle(self, idle_time: float = 0.5, timeout: Optional[float] = None) -> bool:
+        """
+        진행 중인 요청이 없는 상태가 idle_time초 동안 유지될 때까지 기다립니다.
+        롱 폴링 등으로 유휴 상태가 오지 않으면 timeout 후 False를 반환합니다.
+        """
+        self._events.clear()
+        deadline = time.monotonic() + (timeout or self.timeout)
+        while True:
+            now = time.monotonic()
+            if not self._inflight and now - self._last_network_activity >= idle_time:
+                return True
+            if now >= deadline:
+                return False
+            # 다음 이벤트가 오거나 유휴 시간이 채워질 때까지 대기
+            wait = idle_time - (now - self._last_network_activity) if not self._inflight else deadline - now
+            try:
+                self._recv(min(max(wait, 0.01), deadline - now))
+            except websocket.WebSocketTimeoutException:
+                pass
+
+    # ------------------------------------------------------------------
+    # 페이지 조작
+    # ------------------------------------------------------------------
+    def navigate(self, url: str, timeout: Optional[float] = None):
+        """페이지로 이동하고 load 이벤트를 기다립니다."""
+        self._events.clear()
+        self._inflight.clear()
+        result = self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CDPError(f"페이지 이동 실패: {result['errorText']}")
+        self.wait_for_event("Page.loadEventFired", timeout)
+
+    def evaluate(self, expression: str, timeout: Optional[float] = None) -> any:
+        """
+        JavaScript를 실행하고 결과 값을 반환합니다.
+        Promise를 반환하는 식은 완료될 때까지 브라우저 안에서 기다립니다.
+        """
+        result = self.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": True,
+        }, timeout)
+        if result.get("exceptionDetails"):
+            details = result["exceptionDetails"]
+            message = details.get("exception", {}).get("description") or details.get("text")
+            raise CDPError(f"JavaScript 실행 오류: {message}")
+        return result.get("result", {}).get("value")
+
+    def wait_for_selector(self, selector: str, timeout: float = 30) -> bool:
+        """
+        선택자에 해당하는 요소가 나타날 때까지 기다립니다.
+        브라우저 안의 MutationObserver로 DOM 변경 시에만 확인하므로 왕복 한 번으로 끝납니다.
+        """
+        script = """
+        new Promise((resolve) => {
+            const selector = %s;
+            if (document.querySelector(selector)) return resolve(true);
+            const observer = new MutationObserver(() => {
+                if (document.querySelector(selector)) {
+                    observer.disconnect();
+                    resolve(true);
+                }
+            });
+            observer.observe(document.documentElement, {childList: true, subtree: true});
+            setTimeout(() => { observer.disconnect(); resolve(false); }, %d);
+        })
+        """ % (json.dumps(selector), int(timeout * 1000))
+        return bool(self.evaluate(script, timeout + 5))
+
+    @property
+    def pid(self) -> Optional[int]:
+        """브라우저 프로세스 pid (메모리 측정용)"""
+        return self.process.pid if self.process else None
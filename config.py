@@ -11,9 +11,19 @@ load_dotenv()
 SCHOOL_MENU_API_URL = os.getenv("SCHOOL_MENU_API_URL", "")
 SCHOOL_CODE = os.getenv("SCHOOL_CODE", "")
 SCHOOL_MENU_WEBSITE_URL = os.getenv("SCHOOL_MENU_WEBSITE_URL", "")
+# API 요청 타임아웃(초)
+SCHOOL_MENU_API_TIMEOUT = float(os.getenv("SCHOOL_MENU_API_TIMEOUT", "5") or 5)
+# API가 기간 조회(start/end 파라미터)를 지원하면 true: 여러 날짜를 한 번의 요청으로 가져옴
+SCHOOL_MENU_API_BATCH = os.getenv("SCHOOL_MENU_API_BATCH", "false").lower() == "true"
+# 기간 조회 한 번에 요청할 최대 일수
+SCHOOL_MENU_API_BATCH_DAYS = max(1, int(os.getenv("SCHOOL_MENU_API_BATCH_DAYS", "7") or 7))
 
 # Slack Webhook Configuration (for scheduled notifications)
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "")
+# 전송 형식: text(일반 텍스트) 또는 blocks(Block Kit)
+SLACK_MESSAGE_FORMAT = os.getenv("SLACK_MESSAGE_FORMAT", "text").lower()
+# 렌더링 프로필 (render_cache.RENDER_PROFILES): default(조식/중식/석식), lunch(중식만)
+SLACK_RENDER_PROFILE = os.getenv("SLACK_RENDER_PROFILE", "default")
 
 # Selenium Configuration
 # 로컬 환경에서는 자동으로 false (브라우저 창 표시)
@@ -27,6 +37,61 @@ else:
     # Linux = 서버 환경 (헤드리스), Windows/Mac = 로컬 환경 (브라우저 표시)
     SELENIUM_HEADLESS = platform.system() == "Linux"
 
+# Browser Backend Configuration
+# selenium: chromedriver(WebDriver) 사용, cdp: Chrome DevTools Protocol로 직접 제어
+BROWSER_BACKEND = os.getenv("BROWSER_BACKEND", "selenium").lower()
+# CDP 백엔드에서 사용할 Chrome 실행 파일 경로 (비워두면 PATH에서 검색)
+CHROME_BINARY = os.getenv("CHROME_BINARY", "")
+
+# 포털 날짜 선택의 이전/다음 날짜 버튼 CSS 선택자 (오늘이 아닌 날짜를 가져올 때 사용)
+PORTAL_DATE_PREV_SELECTOR = os.getenv("PORTAL_DATE_PREV_SELECTOR", ".nb-p-time-select-prev")
+PORTAL_DATE_NEXT_SELECTOR = os.getenv("PORTAL_DATE_NEXT_SELECTOR", ".nb-p-time-select-next")
+
+# Menu Rules Configuration
+# 식당 이름 정규화/코스명 정리/중식 정렬 순서 규칙 파일
+MENU_RULES_PATH = os.getenv("MENU_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "menu_rules.json"))
+
+# Low-memory Configuration
+# 작은 러너(컨테이너)에서 실행할 때 Chrome 프로세스 수와 파싱 메모리를 줄입니다.
+LOW_MEMORY_MODE = os.getenv("LOW_MEMORY_MODE", "false").lower() == "true"
+# 브라우저 + Python RSS 합계 예산(MB), 0이면 측정만 하고 제한하지 않음
+MEMORY_BUDGET_MB = int(os.getenv("MEMORY_BUDGET_MB", "0") or 0)
+# 예산 초과 시 동작: degrade(작업 축소 후 계속) 또는 abort(크롤링 중단)
+MEMORY_BUDGET_ACTION = os.getenv("MEMORY_BUDGET_ACTION", "degrade").lower()
+# 오타(예: abrot)가 조용히 degrade로 동작하지 않도록 시작 시점에 확인
+if MEMORY_BUDGET_ACTION not in ("degrade", "abort"):
+    raise ValueError(f"MEMORY_BUDGET_ACTION은 degrade 또는 abort여야 합니다: {MEMORY_BUDGET_ACTION!r}")
+
+# 여러 날짜를 가져올 때(iter_menus) 동시에 크롤링할 최대 개수
+# 날짜마다 Chrome이 하나씩 뜨므로 작은 러너에서는 1로 설정
+MENU_FETCH_WORKERS = max(1, int(os.getenv("MENU_FETCH_WORKERS", "2") or 2))
+
+# Menu Store Configuration
+# 크롤링한 메뉴를 날짜별 JSON으로 저장하는 디렉터리
+MENU_STORE_DIR = os.getenv("MENU_STORE_DIR", "menu_data")
+
+# 저장된 메뉴를 크롤링 없이 바로 사용할 최대 나이(초), 0이면 항상 새로 가져옴
+MENU_STORE_TTL = int(os.getenv("MENU_STORE_TTL", "10800") or 0)
+
+# Prefetch Configuration (앞으로 N일 메뉴를 미리 가져와 저장소를 채움)
+PREFETCH_DAYS = max(1, int(os.getenv("PREFETCH_DAYS", "7") or 7))
+# 새로고침 주기(초)와 지터 비율 (주기의 최대 몇 %를 무작위로 더할지)
+PREFETCH_INTERVAL = int(os.getenv("PREFETCH_INTERVAL", "3600") or 3600)
+PREFETCH_JITTER = float(os.getenv("PREFETCH_JITTER", "0.1") or 0)
+
+# Profiling Configuration (선택 기능, main.py --profiling으로도 켤 수 있음)
+# true이면 main.py 실행과 MenuFetcher.get_menu_by_date를 프로파일링하여 PROFILE_DIR에 저장
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# sample(샘플링, 오버헤드 작음), deterministic(cProfile), both
+PROFILE_MODE = os.getenv("PROFILE_MODE", "sample").lower()
+# 샘플링 간격(초)
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005") or 0.005)
+
+# Menu HTTP Server Configuration (읽기 전용 JSON 서버)
+MENU_SERVER_HOST = os.getenv("MENU_SERVER_HOST", "127.0.0.1")
+MENU_SERVER_PORT = int(os.getenv("MENU_SERVER_PORT", "8080") or 8080)
+
 # Validate required tokens
 # 검증은 각 모듈에서 필요할 때 수행하도록 변경
 # (main.py는 SLACK_WEBHOOK_URL 필요)
@@ -1,6 +1,17 @@
 """
 학교 홈페이지에서 메뉴를 크롤링하여 Slack Webhook으로 전송하는 스크립트
 GitHub Actions에서 매일 자동 실행되도록 설계됨
+
+인자 없이 실행하면 오늘 메뉴를 가져와 전송합니다. 하위 명령:
+    fetch   메뉴 가져오기 (--date / --range, --output json|text)
+    render  저장된(없으면 가져온) 메뉴를 메시지로 렌더링
+    send    메뉴 전송 (--dry-run이면 전송하지 않고 출력)
+    bench   샘플 소스와 로컬 Slack 대역으로 전체 파이프라인 벤치마크
+    serve   저장된 메뉴를 제공하는 HTTP 서버 실행
+    prefetch 앞으로 N일 메뉴를 미리 가져와 저장소 채우기 (--loop이면 계속 새로고침)
+
+--profiling을 명령 앞에 붙이면(또는 PROFILE_ENABLED=true) 실행 전체를 프로파일링하여
+PROFILE_DIR에 collapsed stack, pstats, 할당 위치 상위 목록을 저장합니다.
 """
 import sys
 # Windows 인코딩 문제 해결
@@ -9,8 +20,21 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+import argparse
+import contextlib
+import io
+import json
+import math
+import time
+from datetime import datetime
+from typing import Dict, List
 from webhook_sender import WebhookSender
-from config import SLACK_WEBHOOK_URL
+from menu_fetcher import MenuFetcher, KST
+from menu_store import MenuStore
+from menu_server import MAX_RANGE_DAYS
+from config import SLACK_WEBHOOK_URL, MENU_SERVER_HOST, MENU_SERVER_PORT
+from config import PREFETCH_DAYS, PREFETCH_INTERVAL, PROFILE_ENABLED, PROFILE_DIR, PROFILE_MODE
+from profiling import RunProfiler, PROFILE_MODES
 
 
 def main():
@@ -34,6 +58,262 @@ def main():
         exit(1)
 
 
-if __name__ == "__main__":
-    main()
+def _dates_from_args(args) -> List[str]:
+    """
+    --date / --range 인자를 날짜 문자열 목록으로 변환 (기본값: 오늘 KST)
+    잘못된 날짜, 거꾸로 된 기간, MAX_RANGE_DAYS를 넘는 기간은 오류를 출력하고 종료합니다.
+    """
+    try:
+        if getattr(args, 'range', None):
+            # 웹사이트 소스는 날짜마다 Chrome을 실행하므로 기간 길이를 제한
+            return MenuStore.date_range(*args.range, max_days=MAX_RANGE_DAYS)
+        if getattr(args, 'date', None):
+            return [datetime.strptime(args.date, "%Y-%m-%d").strftime("%Y-%m-%d")]
+    except ValueError as e:
+        print(f"❌ 날짜 인자 오류: {e}")
+        sys.exit(1)
+    return [datetime.now(KST).strftime("%Y-%m-%d")]
+
+
+def _fetcher_from_args(args, **kwargs) -> MenuFetcher:
+    """--source로 MenuFetcher를 만듭니다. 지정한 소스의 URL이 없으면 오류를 출력하고 종료합니다."""
+    try:
+        return MenuFetcher(source=args.source, **kwargs)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+def cmd_fetch(args):
+    """메뉴를 가져와 출력합니다. 여러 날짜는 완료되는 순서대로 한 줄씩 출력합니다."""
+    fetcher = _fetcher_from_args(args)
+    failed = False
+    out = sys.stdout
+    # 진행 로그는 stderr로 보내 stdout에는 결과만 남김
+    with contextlib.redirect_stdout(sys.stderr):
+        for result in fetcher.iter_menus(_dates_from_args(args)):
+            failed = failed or bool(result['error'])
+            if args.output == 'json':
+                line = json.dumps(result, ensure_ascii=False)
+            elif result['error']:
+                line = f"❌ {result['date']}: {result['error']['message']}"
+            else:
+                line = fetcher.format_menu_message(result['menu'])
+            print(line, file=out, flush=True)
+    if failed:
+        sys.exit(1)
+
+
+def cmd_render(args):
+    """저장된 메뉴(없으면 가져온 메뉴)를 렌더링하여 출력합니다."""
+    sender = WebhookSender(dry_run=True, message_format=args.format, profile=args.profile,
+                           menu_fetcher=_fetcher_from_args(args))
+    for date_str in _dates_from_args(args):
+        menu_data = sender.menu_fetcher.store.get(date_str)
+        if menu_data is None:
+            menu_data = sender.menu_fetcher.get_menu_by_date(datetime.strptime(date_str, "%Y-%m-%d"))
+        rendered = sender.render_cache.render(menu_data, sender.message_format, sender.profile)
+        print(rendered if sender.message_format == 'text' else json.dumps(rendered, ensure_ascii=False, indent=2))
+
+
+def cmd_send(args):
+    """메뉴를 전송합니다 (--dry-run이면 출력만)."""
+    try:
+        sender = WebhookSender(dry_run=args.dry_run, message_format=args.format, profile=args.profile,
+                               menu_fetcher=_fetcher_from_args(args))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.date or args.range:
+        results = sender.send_menus(_dates_from_args(args))
+        success = bool(results) and all(results.values())
+    else:
+        success = sender.send_today_menu()
+    if not success:
+        print("❌ 전송 실패")
+        sys.exit(1)
+    print("✅ 전송 완료")
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """정렬된 값의 백분위수 (가장 가까운 순위 방식)"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def cmd_bench(args):
+    """
+    샘플(또는 지정한) 소스와 로컬 Slack 대역 서버로 fetch -> render -> send를
+    N번 반복하고 단계별 지연 시간 백분위수와 처리량을 보고합니다.
+    가져오기는 저장소를 건너뛰고(live), 렌더링은 캐시를 거치지 않고 매번 새로 수행합니다.
+    """
+    from slack_stub import StubWebhookServer
+
+    fetcher = _fetcher_from_args(args, browser_backend=args.backend)
+    stages: Dict[str, List[float]] = {'fetch': [], 'render': [], 'send': [], 'total': []}
+    date = datetime.now(KST)
+
+    with StubWebhookServer() as stub:
+        sender = WebhookSender(webhook_url=stub.url, menu_fetcher=fetcher)
+        # 전송 성공 로그가 측정 결과를 가리지 않도록 출력 억제
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.warmup):
+                sender._send_message(fetcher.format_menu_message(fetcher.get_menu_by_date(date, live=True)))
+            started = time.perf_counter()
+            for _ in range(args.iterations):
+                t0 = time.perf_counter()
+                menu_data = fetcher.get_menu_by_date(date, live=True)
+                t1 = time.perf_counter()
+                message = fetcher.format_menu_message(menu_data)
+                t2 = time.perf_counter()
+                if not sender._send_message(message):
+                    raise RuntimeError("Slack 대역 서버 전송 실패")
+                t3 = time.perf_counter()
+                stages['fetch'].append(t1 - t0)
+                stages['render'].append(t2 - t1)
+                stages['send'].append(t3 - t2)
+                stages['total'].append(t3 - t0)
+            elapsed = time.perf_counter() - started
+        received = stub.received
+
+    report = {
+        'iterations': args.iterations,
+        'source': args.source,
+        'elapsed_s': elapsed,
+        'throughput_per_s': args.iterations / elapsed if elapsed else 0.0,
+        'stub_received': received,
+        'stages_ms': {},
+    }
+    for stage, values in stages.items():
+        values.sort()
+        report['stages_ms'][stage] = {
+            'p50': _percentile(values, 50) * 1000,
+            'p90': _percentile(values, 90) * 1000,
+            'p99': _percentile(values, 99) * 1000,
+            'max': (values[-1] if values else 0.0) * 1000,
+            'mean': (sum(values) / len(values) if values else 0.0) * 1000,
+        }
+
+    if args.output == 'json':
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    print(f"📊 벤치마크: {args.iterations}회, 소스={args.source}, "
+          f"{report['throughput_per_s']:.1f}회/초 (총 {elapsed:.3f}초)")
+    print(f"{'단계':<8}{'p50(ms)':>10}{'p90(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    for stage, stats in report['stages_ms'].items():
+        print(f"{stage:<8}{stats['p50']:>10.3f}{stats['p90']:>10.3f}{stats['p99']:>10.3f}{stats['max']:>10.3f}")
 
+
+def cmd_serve(args):
+    """저장된 메뉴를 제공하는 HTTP 서버를 실행합니다."""
+    from menu_server import serve
+    serve(args.host, args.port)
+
+
+def cmd_prefetch(args):
+    """앞으로 N일 메뉴를 미리 가져옵니다. --loop이면 Ctrl+C까지 주기적으로 새로고침합니다."""
+    from menu_prefetcher import MenuPrefetcher
+    prefetcher = MenuPrefetcher(_fetcher_from_args(args), days=args.days,
+                                interval=args.interval, max_workers=args.workers)
+    if not args.loop:
+        statuses = prefetcher.refresh_due(force=True)
+        if 'error' in statuses.values():
+            sys.exit(1)
+        return
+    try:
+        prefetcher.run_forever()
+    except KeyboardInterrupt:
+        print("🛑 프리페치 중지")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    # 하위 명령의 --profile(렌더링 프로필)이 --profile-dir/--profile-mode의 약어로
+    # 해석되지 않도록 약어를 허용하지 않음 (실행 프로파일링 플래그는 --profiling)
+    parser = argparse.ArgumentParser(description="학교 급식 메뉴 Slack 봇", allow_abbrev=False)
+    parser.add_argument("--profiling", action="store_true", default=PROFILE_ENABLED,
+                        help="실행 전체를 프로파일링하여 결과를 저장 (PROFILE_ENABLED)")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help="프로파일 저장 디렉터리 (기본값: %(default)s)")
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, default=PROFILE_MODE,
+                        help="sample(샘플링), deterministic(cProfile), both")
+    subparsers = parser.add_subparsers(dest="command")
+
+    def add_date_args(sub):
+        group = sub.add_mutually_exclusive_group()
+        group.add_argument("--date", help="날짜 (YYYY-MM-DD, 기본값: 오늘)")
+        group.add_argument("--range", nargs=2, metavar=("START", "END"), help=f"기간 (시작일 종료일, 포함, 최대 {MAX_RANGE_DAYS}일)")
+
+    def add_source_arg(sub, default='auto'):
+        sub.add_argument("--source", choices=MenuFetcher.SOURCES, default=default,
+                         help="메뉴 소스 (기본값: %(default)s)")
+
+    def add_render_args(sub):
+        sub.add_argument("--format", choices=('text', 'blocks'), default=None, help="메시지 형식")
+        sub.add_argument("--profile", default=None, help="렌더링 프로필 (default, lunch)")
+
+    fetch_parser = subparsers.add_parser("fetch", help="메뉴 가져오기")
+    add_date_args(fetch_parser)
+    add_source_arg(fetch_parser)
+    fetch_parser.add_argument("--output", choices=('json', 'text'), default='json')
+    fetch_parser.set_defaults(func=cmd_fetch)
+
+    render_parser = subparsers.add_parser("render", help="메뉴 메시지 렌더링")
+    add_date_args(render_parser)
+    add_source_arg(render_parser)
+    add_render_args(render_parser)
+    render_parser.set_defaults(func=cmd_render)
+
+    send_parser = subparsers.add_parser("send", help="메뉴 전송")
+    add_date_args(send_parser)
+    add_source_arg(send_parser)
+    add_render_args(send_parser)
+    send_parser.add_argument("--dry-run", action="store_true", help="전송하지 않고 보낼 내용만 출력")
+    send_parser.set_defaults(func=cmd_send)
+
+    bench_parser = subparsers.add_parser("bench", help="전체 파이프라인 벤치마크 (로컬 Slack 대역 사용)")
+    add_source_arg(bench_parser, default='sample')
+    bench_parser.add_argument("-n", "--iterations", type=int, default=100)
+    bench_parser.add_argument("--warmup", type=int, default=3)
+    bench_parser.add_argument("--backend", choices=('selenium', 'cdp'), default=None,
+                              help="website 소스에서 사용할 브라우저 백엔드")
+    bench_parser.add_argument("--output", choices=('json', 'text'), default='text')
+    bench_parser.set_defaults(func=cmd_bench)
+
+    serve_parser = subparsers.add_parser("serve", help="메뉴 조회 HTTP 서버 실행")
+    serve_parser.add_argument("--host", default=MENU_SERVER_HOST)
+    serve_parser.add_argument("--port", type=int, default=MENU_SERVER_PORT)
+    serve_parser.set_defaults(func=cmd_serve)
+
+    prefetch_parser = subparsers.add_parser("prefetch", help="앞으로 N일 메뉴 미리 가져오기")
+    add_source_arg(prefetch_parser)
+    prefetch_parser.add_argument("--days", type=int, default=PREFETCH_DAYS)
+    prefetch_parser.add_argument("--interval", type=int, default=PREFETCH_INTERVAL,
+                                 help="--loop에서 새로고침 주기(초)")
+    prefetch_parser.add_argument("--workers", type=int, default=1, help="동시 크롤링 수")
+    prefetch_parser.add_argument("--loop", action="store_true", help="종료할 때까지 주기적으로 새로고침")
+    prefetch_parser.set_defaults(func=cmd_prefetch)
+
+    return parser
+
+
+def _run_profiler(args):
+    """
+    --profiling이면 실행 전체를 감싸는 RunProfiler를 반환합니다.
+    serve와 prefetch --loop는 종료될 때까지 결과를 쓰지 않고 tracemalloc 부담만 계속되므로 제외합니다.
+    """
+    if not args.profiling:
+        return contextlib.nullcontext()
+    if args.command == 'serve' or getattr(args, 'loop', False):
+        print("⚠️  serve, prefetch --loop는 계속 실행되는 명령이므로 실행 전체 프로파일링을 건너뜁니다.")
+        return contextlib.nullcontext()
+    return RunProfiler(args.command or "send-today", args.profile_dir, args.profile_mode)
+
+
+if __name__ == "__main__":
+    cli_args = build_parser().parse_args()
+    with _run_profiler(cli_args):
+        if cli_args.command is None:
+            main()
+        else:
+            cli_args.func(cli_args)
@@ -0,0 +1,160 @@
+"""
+크롤링 중 브라우저와 Python 프로세스의 메모리(RSS)를 측정하는 모듈
+작은 러너(컨테이너)에서 메모리 예산을 넘지 않도록 감시합니다.
+"""
+import os
+import sys
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    # psutil이 없으면 /proc 파일시스템으로 측정 (Linux 전용)
+    psutil = None
+
+
+# 예산 초과 시 동작
+MEMORY_BUDGET_ACTIONS = ("degrade", "abort")
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """메모리 예산을 초과했을 때 발생하는 예외"""
+
+
+def _read_proc_rss_kb(pid: int) -> int:
+    """/proc/<pid>/status에서 VmRSS(kB)를 읽습니다."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _proc_children(root_pid: int) -> List[int]:
+    """/proc를 훑어 root_pid의 모든 하위 프로세스 pid를 찾습니다."""
+    parents = {}
+    try:
+        pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return []
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+                # 프로세스 이름에 공백/괄호가 있을 수 있으므로 마지막 ')' 이후를 파싱
+                stat = f.read().rsplit(")", 1)[1].split()
+            parents.setdefault(int(stat[1]), []).append(pid)
+        except (OSError, ValueError, IndexError):
+            continue
+
+    result = []
+    stack = [root_pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            result.append(child)
+            stack.append(child)
+    return result
+
+
+def process_rss_mb(pid: Optional[int] = None) -> float:
+    """단일 프로세스의 현재 RSS(MB)를 반환합니다."""
+    pid = pid or os.getpid()
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return 0.0
+    if sys.platform.startswith("linux"):
+        return _read_proc_rss_kb(pid) / 1024
+    return 0.0
+
+
+def process_tree_rss_mb(root_pid: Optional[int]) -> float:
+    """
+    프로세스와 모든 하위 프로세스의 RSS 합계(MB)를 반환합니다.
+    chromedriver 아래에 뜨는 Chrome 브라우저/렌더러 프로세스를 모두 합산합니다.
+    """
+    if not root_pid:
+        return 0.0
+    if psutil is not None:
+        try:
+            root = psutil.Process(root_pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return 0.0
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+    if sys.platform.startswith("linux"):
+        pids = [root_pid] + _proc_children(root_pid)
+        return sum(_read_proc_rss_kb(pid) for pid in pids) / 1024
+    return 0.0
+
+
+class MemoryMonitor:
+    """
+    브라우저와 Python 프로세스의 RSS를 샘플링하고 최대값(peak)을 기록합니다.
+
+    budget_mb가 0이면 측정만 하고 예산 검사는 하지 않습니다.
+    action이 'abort'이면 예산 초과 시 MemoryBudgetExceeded를 발생시키고,
+    'degrade'이면 over_budget 플래그만 세워 호출 측에서 작업을 줄이도록 합니다.
+    """
+
+    def __init__(self, budget_mb: int = 0, action: str = "degrade"):
+        if action not in MEMORY_BUDGET_ACTIONS:
+            raise ValueError(f"알 수 없는 메모리 예산 동작입니다: {action}")
+        self.budget_mb = budget_mb
+        self.action = action
+        self.browser_pid: Optional[int] = None
+        self.peak_python_mb = 0.0
+        self.peak_browser_mb = 0.0
+        self.peak_total_mb = 0.0
+        self.over_budget = False
+        self.samples = 0
+
+    def attach_browser(self, pid: Optional[int]):
+        """측정할 브라우저(드라이버) 프로세스의 pid를 등록합니다."""
+        self.browser_pid = pid
+
+    def sample(self, stage: str = "") -> Dict[str, float]:
+        """
+        현재 RSS를 측정하고 최대값을 갱신합니다.
+
+        Args:
+            stage: 로그에 표시할 단계 이름
+
+        Returns:
+            Dict: {'python': MB, 'browser': MB, 'total': MB}
+        """
+        python_mb = process_rss_mb()
+        browser_mb = process_tree_rss_mb(self.browser_pid)
+        total_mb = python_mb + browser_mb
+        self.samples += 1
+        self.peak_python_mb = max(self.peak_python_mb, python_mb)
+        self.peak_browser_mb = max(self.peak_browser_mb, browser_mb)
+        self.peak_total_mb = max(self.peak_total_mb, total_mb)
+
+        if self.budget_mb and total_mb > self.budget_mb:
+            message = (f"메모리 예산 초과{f' ({stage})' if stage else ''}: "
+                       f"{total_mb:.0f}MB > {self.budget_mb}MB")
+            if self.action == "abort":
+                raise MemoryBudgetExceeded(f"❌ {message}")
+            if not self.over_budget:
+                print(f"⚠️  {message} - 저메모리 동작으로 전환합니다.")
+            self.over_budget = True
+
+        return {'python': python_mb, 'browser': browser_mb, 'total': total_mb}
+
+    def report(self):
+        """측정된 최대 RSS를 출력합니다."""
+        if not self.samples:
+            return
+        budget = f" / 예산 {self.budget_mb}MB" if self.budget_mb else ""
+        print(f"📊 최대 메모리 사용량: 합계 {self.peak_total_mb:.0f}MB "
+              f"(Python {self.peak_python_mb:.0f}MB, 브라우저 {self.peak_browser_mb:.0f}MB){budget}")
@@ -0,0 +1,221 @@
+"""
+메뉴 기록을 열 기반(columnar) 테이블로 내보내고 분석하는 모듈
+
+식당/코스/메뉴 항목으로 중첩된 메뉴 딕셔너리를 메뉴 항목 한 줄당 한 행으로 펼쳐
+(date, meal, restaurant, restaurant_simple, course, price, item) 열로 저장합니다.
+분석은 pandas/NumPy 벡터 연산으로 수행하므로 수년치 기록도 빠르게 집계됩니다.
+
+pandas, pyarrow는 선택 의존성입니다: pip install pandas pyarrow
+"""
+import argparse
+import re
+from typing import Dict, Iterable, List, Optional
+from menu_fetcher import simplify_restaurant_name
+from menu_store import MenuStore
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = None
+    pd = None
+
+# 열 순서 (내보내기 파일의 스키마)
+COLUMNS = ['date', 'meal', 'restaurant', 'restaurant_simple', 'course', 'price', 'item']
+MEALS = ['breakfast', 'lunch', 'dinner']
+# 반복 값이 많은 열은 category로 저장하여 메모리와 파일 크기를 줄임
+CATEGORY_COLUMNS = ['meal', 'restaurant', 'restaurant_simple', 'course', 'item']
+
+_NON_DIGIT = re.compile(r"[^0-9]")
+
+
+def _require_pandas():
+    if pd is None:
+        raise ImportError("메뉴 분석에는 pandas가 필요합니다: pip install pandas pyarrow")
+
+
+def parse_price(price: str) -> int:
+    """'5,500 원' 형식의 가격을 정수로 변환합니다 (가격이 없으면 0)."""
+    digits = _NON_DIGIT.sub("", price or "")
+    return int(digits) if digits else 0
+
+
+def flatten_menus(menus: Iterable[Dict[str, any]]) -> Dict[str, List]:
+    """
+    메뉴 딕셔너리들을 열(column) 리스트로 펼칩니다.
+
+    Args:
+        menus: MenuFetcher가 반환하는 메뉴 딕셔너리 목록
+
+    Returns:
+        Dict: 열 이름 -> 값 리스트 (모든 리스트 길이가 같음)
+    """
+    columns = {name: [] for name in COLUMNS}
+    date_col, meal_col, restaurant_col = columns['date'], columns['meal'], columns['restaurant']
+    simple_col, course_col, price_col, item_col = (
+        columns['restaurant_simple'], columns['course'], columns['price'], columns['item'])
+    simple_names = {}
+
+    for menu in menus:
+        date = menu['date']
+        for meal in MEALS:
+            restaurants = menu.get(meal)
+            if not restaurants:
+                continue
+            if isinstance(restaurants, list):
+                # API 형식: 식당 구분 없이 메뉴 항목만 있는 경우
+                restaurants = {'': [{'course': '', 'price': '', 'menu': restaurants}]}
+            for restaurant, courses in restaurants.items():
+                simple = simple_names.get(restaurant)
+                if simple is None:
+                    simple = simple_names[restaurant] = simplify_restaurant_name(restaurant)
+                for course in courses:
+                    items = course.get('menu', [])
+                    n = len(items)
+                    if not n:
+                        continue
+                    date_col.extend([date] * n)
+                    meal_col.extend([meal] * n)
+                    restaurant_col.extend([restaurant] * n)
+                    simple_col.extend([simple] * n)
+                    course_col.extend([course.get('course', '')] * n)
+                    price_col.extend([parse_price(course.get('price', ''))] * n)
+                    item_col.extend(items)
+    return columns
+
+
+def to_dataframe(columns: Dict[str, List], dates: Optional[Iterable[str]] = None) -> "pd.DataFrame":
+    """
+    펼친 열을 pandas DataFrame으로 변환합니다 (date는 datetime64, price는 int32).
+
+    Args:
+        dates: 기록된 전체 날짜 ('YYYY-MM-DD'). 메뉴가 하나도 없던 날은 행이 없으므로
+               empty_menu_rate가 이 날짜들을 알 수 있도록 df.attrs['dates']에 보관합니다.
+    """
+    _require_pandas()
+    df = pd.DataFrame({
+        'date': pd.to_datetime(pd.Series(columns['date'], dtype="object"), format="%Y-%m-%d"),
+        'price': np.asarray(columns['price'], dtype=np.int32),
+        **{name: pd.Categorical(columns[name]) for name in CATEGORY_COLUMNS},
+    })[COLUMNS]
+    if dates is not None:
+        df.attrs['dates'] = sorted(set(dates))
+    return df
+
+
+def load_store(store: Optional[MenuStore] = None) -> "pd.DataFrame":
+    """저장소에 쌓인 모든 날짜의 메뉴를 DataFrame으로 읽어옵니다."""
+    store = store or MenuStore()
+    menus = [menu for menu in (store.get(date_str) for date_str in store.dates()) if menu]
+    return to_dataframe(flatten_menus(menus), dates=[menu['date'] for menu in menus])
+
+
+def export_table(df: "pd.DataFrame", path: str):
+    """
+    DataFrame을 열 기반 파일로 저장합니다.
+    확장자가 .arrow/.feather이면 Arrow IPC, 그 외에는 Parquet 형식입니다.
+    """
+    _require_pandas()
+    if path.endswith((".arrow", ".feather")):
+        df.to_feather(path)
+    else:
+        df.to_parquet(path, index=False)
+
+
+def load_table(path: str) -> "pd.DataFrame":
+    """export_table로 저장한 파일을 읽어옵니다."""
+    _require_pandas()
+    if path.endswith((".arrow", ".feather")):
+        return pd.read_feather(path)
+    return pd.read_parquet(path)
+
+
+def _courses(df: "pd.DataFrame") -> "pd.DataFrame":
+    """메뉴 항목 행을 코스 단위(날짜·식사·식당·코스당 한 행)로 줄입니다."""
+    return df.drop_duplicates(subset=['date', 'meal', 'restaurant', 'course'])
+
+
+def price_trends(df: "pd.DataFrame", freq: str = "M") -> "pd.DataFrame":
+    """
+    식당별 기간(기본 월) 가격 추이
+
+    Returns:
+        DataFrame: restaurant_simple, period, mean, min, max, courses
+    """
+    courses = _courses(df)
+    courses = courses[courses['price'].to_numpy() > 0]
+    period = courses['date'].dt.to_period(freq).rename('period')
+    grouped = courses.groupby([courses['restaurant_simple'], period], observed=True)['price']
+    trends = grouped.agg(['mean', 'min', 'max', 'count']).rename(columns={'count': 'courses'})
+    return trends.reset_index()
+
+
+def dish_frequency(df: "pd.DataFrame", top: int = 20, by_restaurant: bool = False) -> "pd.DataFrame":
+    """
+    메뉴 항목 등장 횟수 상위 목록
+
+    Args:
+        top: 반환할 항목 수 (by_restaurant이면 식당별 상위 항목 수)
+        by_restaurant: 식당별로 나누어 집계할지 여부
+    """
+    if not by_restaurant:
+        counts = df['item'].value_counts()
+        return counts.head(top).rename_axis('item').reset_index(name='count')
+    counts = df.groupby(['restaurant_simple', 'item'], observed=True).size().reset_index(name='count')
+    counts = counts.sort_values(['restaurant_simple', 'count'], ascending=[True, False])
+    return counts.groupby('restaurant_simple', observed=True).head(top).reset_index(drop=True)
+
+
+def empty_menu_rate(df: "pd.DataFrame", dates: Optional[Iterable[str]] = None) -> "pd.DataFrame":
+    """
+    식사·식당별로 기록된 전체 날짜 중 메뉴가 없었던 날의 비율
+
+    Args:
+        dates: 기록된 전체 날짜. 비워두면 df.attrs['dates'](to_dataframe/load_store가 설정)를 사용하고,
+               그것도 없으면 df에 행이 있는 날짜만 사용합니다 (모든 식당이 메뉴 없던 날은 빠짐).
+
+    Returns:
+        DataFrame: meal, restaurant_simple, days_served, days_empty, empty_rate
+    """
+    if dates is None:
+        dates = df.attrs.get('dates')
+    if dates is not None:
+        total_days = pd.Index(pd.to_datetime(list(dates), format="%Y-%m-%d")).union(df['date'].unique()).nunique()
+    else:
+        total_days = df['date'].nunique()
+    served = df.groupby(['meal', 'restaurant_simple'], observed=True)['date'].nunique()
+    served = served.to_frame('days_served').reset_index()
+    served['days_empty'] = total_days - served['days_served'].to_numpy()
+    served['empty_rate'] = served['days_empty'].to_numpy() / max(total_days, 1)
+    return served.sort_values('empty_rate', ascending=False, ignore_index=True)
+
+
+def standard_reports(df: "pd.DataFrame", top: int = 20,
+                     dates: Optional[Iterable[str]] = None) -> Dict[str, "pd.DataFrame"]:
+    """기본 리포트(가격 추이, 메뉴 빈도, 메뉴 없음 비율)를 한 번에 계산합니다."""
+    return {
+        'price_trends': price_trends(df),
+        'dish_frequency': dish_frequency(df, top=top),
+        'empty_menu_rate': empty_menu_rate(df, dates=dates),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="메뉴 기록 내보내기 및 분석")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="저장소의 메뉴 기록을 Parquet/Arrow로 내보내기")
+    export_parser.add_argument("--output", default="menus.parquet", help="출력 파일 (.parquet, .arrow)")
+    report_parser = subparsers.add_parser("report", help="기본 리포트 출력")
+    report_parser.add_argument("--input", help="내보낸 파일 (비워두면 저장소에서 직접 읽음)")
+    report_parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        table = load_store()
+        export_table(table, args.output)
+        print(f"✅ {len(table)}행을 {args.output}에 저장했습니다.")
+    else:
+        table = load_table(args.input) if args.input else load_store()
+        for name, report in standard_reports(table, top=args.top).items():
+            print(f"\n## {name}")
+            print(report.to_string(index=False))
@@ -2,11 +2,16 @@
 학교 급식 메뉴를 가져오는 모듈
 """
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Iterable, Iterator, Union
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import json
+import re
 import time
 import platform
+import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -16,6 +21,15 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 from config import SCHOOL_MENU_API_URL, SCHOOL_CODE, SCHOOL_MENU_WEBSITE_URL, SELENIUM_HEADLESS
+from config import SCHOOL_MENU_API_TIMEOUT, SCHOOL_MENU_API_BATCH, SCHOOL_MENU_API_BATCH_DAYS
+from config import LOW_MEMORY_MODE, MEMORY_BUDGET_MB, MEMORY_BUDGET_ACTION
+from config import BROWSER_BACKEND, CHROME_BINARY, MENU_FETCH_WORKERS, MENU_STORE_TTL, PROFILE_ENABLED
+from config import PORTAL_DATE_PREV_SELECTOR, PORTAL_DATE_NEXT_SELECTOR
+from cdp_browser import CDPBrowser, CDPError
+from memory_monitor import MemoryMonitor, MemoryBudgetExceeded
+from menu_store import MenuStore, is_sample_menu
+from menu_rules import RULES
+from profiling import RunProfiler
 
 # 한국 시간대 설정 (UTC+9)
 try:
@@ -31,14 +45,199 @@ except ImportError:
         from datetime import timezone, timedelta
         KST = timezone(timedelta(hours=9))
 
+# 저메모리 모드에서 필요한 부분만 파싱하기 위한 SoupStrainer
+RESTAURANT_STRAINER = SoupStrainer("dl", class_="nb-p-04-list-02")
+
+# 서버 환경에서도 안정적으로 동작하도록 추가하는 Chrome 옵션 (Selenium/CDP 공통)
+CHROME_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--window-size=1920,1080',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-extensions',
+    '--disable-software-rasterizer',
+    '--disable-web-security',
+    '--ignore-certificate-errors',
+    '--ignore-ssl-errors',
+    '--ignore-certificate-errors-spki-list',
+    '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+]
+
+# 저메모리 모드에서 Chrome 프로세스 수와 백그라운드 기능을 줄이는 옵션
+LOW_MEMORY_CHROME_ARGS = [
+    '--renderer-process-limit=1',
+    '--process-per-site',
+    '--disable-site-isolation-trials',
+    '--disable-features=site-per-process,IsolateOrigins,Translate,OptimizationHints,MediaRouter,BackForwardCache',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--no-first-run',
+    '--mute-audio',
+    '--blink-settings=imagesEnabled=false',
+    '--js-flags=--max-old-space-size=256',
+]
+
+# 포털 날짜 선택(.nb-p-time-select-current)에 표시된 날짜 텍스트 (Selenium/CDP 공통)
+PORTAL_CURRENT_DATE_SCRIPT = """
+(() => {
+    const el = document.querySelector('.nb-p-time-select-current');
+    return el ? el.textContent.trim() : null;
+})()
+"""
+
+# 이전/다음 날짜 버튼(PORTAL_DATE_PREV_SELECTOR/PORTAL_DATE_NEXT_SELECTOR)을 클릭 (Selenium/CDP 공통)
+PORTAL_DATE_STEP_SCRIPT = """
+(() => {
+    const button = document.querySelector(%s);
+    if (!button) return false;
+    button.click();
+    return true;
+})()
+"""
+
+# 요청 날짜로 이동할 때 누를 수 있는 이전/다음 버튼 최대 횟수
+MAX_DATE_STEPS = 14
+# 포털 날짜 표시 형식 (예: '2024.03.04 (월)')
+PORTAL_DATE_PATTERN = re.compile(r"(\d{4})\D+(\d{1,2})\D+(\d{1,2})")
+
+# CDP 백엔드: '조식'/'중식'/'석식' 텍스트가 포함된 em 탭을 클릭
+CDP_CLICK_TAB_SCRIPT = """
+(() => {
+    const label = %s;
+    const tab = Array.from(document.querySelectorAll('em')).find((em) => em.textContent.includes(label));
+    if (!tab) return false;
+    tab.click();
+    return true;
+})()
+"""
+
+# CDP 백엔드: 모든 식당을 펼치고 DOM 변경이 멈추면 식당별 메뉴를 한 번에 추출
+# (Selenium 경로의 extract_menu_from_tab과 같은 구조를 반환)
+# %s는 식당 펼치기 여부 (메모리 예산 초과로 degrade 중이면 false, 이미 표시된 메뉴만 추출)
+CDP_EXTRACT_MENU_SCRIPT = """
+(async () => {
+    const expand = %s;
+    // BeautifulSoup의 get_text(strip=True)와 같은 결과
+    const text = (el) => {
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        let out = '';
+        let node;
+        while ((node = walker.nextNode())) out += node.nodeValue.trim();
+        return out;
+    };
+    // DOM 변경이 quiet ms 동안 없을 때까지 대기 (최대 max ms)
+    const settle = (quiet, max) => new Promise((resolve) => {
+        let timer;
+        const done = () => { observer.disconnect(); clearTimeout(timer); clearTimeout(limit); resolve(); };
+        const observer = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(done, quiet); });
+        observer.observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+        timer = setTimeout(done, quiet);
+        const limit = setTimeout(done, max);
+    });
+
+    if (expand) {
+        document.querySelectorAll('dl.nb-p-04-list-02').forEach((dl) => {
+            const dt = dl.querySelector('dt');
+            if (dt) dt.click();
+        });
+        await settle(300, 3000);
+    }
+
+    const result = {};
+    for (const dl of document.querySelectorAll('dl.nb-p-04-list-02')) {
+        const nameEl = dl.querySelector('dt span.ng-binding');
+        if (!nameEl) continue;
+        const courses = [];
+        for (const dd of dl.querySelectorAll('dd')) {
+            const course = {};
+            const spans = dd.querySelectorAll('.meals-detail span.ng-binding');
+            if (spans.length >= 1) {
+                course.time = text(spans[0]);
+                course.course = spans.length >= 2 ? text(spans[1]) : '';
+            }
+            const detail = dd.querySelector('.nb-p-04-03');
+            course.menu = detail ? Array.from(detail.querySelectorAll('p')).map(text).filter(Boolean) : [];
+            const mealsDetail = dd.querySelector('.meals-detail');
+            const priceSpan = mealsDetail
+                ? Array.from(mealsDetail.querySelectorAll('span.ng-binding')).find((span) => text(span).includes('원'))
+                : null;
+            course.price = priceSpan ? text(priceSpan) : '';
+            if (course.menu.length) courses.push(course);
+        }
+        if (courses.length) result[text(nameEl)] = courses;
+    }
+    return result;
+})()
+"""
+
+
+class MenuDateMismatch(RuntimeError):
+    """포털에 표시된 날짜가 요청한 날짜와 달라 메뉴를 저장할 수 없을 때 발생하는 예외"""
+
+
+def parse_portal_date(text: Optional[str]) -> Optional[datetime]:
+    """포털 날짜 표시 텍스트를 datetime으로 변환합니다 (형식이 다르면 None)."""
+    match = PORTAL_DATE_PATTERN.search(text or "")
+    if not match:
+        return None
+    try:
+        return datetime(*(int(part) for part in match.groups()))
+    except ValueError:
+        return None
+
+
+def simplify_restaurant_name(name: str) -> str:
+    """식당 이름을 간단하게 변환 (규칙: menu_rules.json의 restaurant_names)"""
+    return RULES.simplify_restaurant_name(name)
+
+
+def clean_course_name(course_name: str) -> str:
+    """코스명을 간단하게 정리 (규칙: menu_rules.json의 course_remove, course_drop)"""
+    return RULES.clean_course_name(course_name)
+
 
 class MenuFetcher:
     """학교 급식 메뉴를 가져오는 클래스"""
     
-    def __init__(self):
+    # 메뉴 소스: auto(API -> 웹사이트 -> 샘플 순), api, website, sample
+    SOURCES = ('auto', 'api', 'website', 'sample')
+    
+    def __init__(self, source: str = 'auto', browser_backend: Optional[str] = None,
+                 profile: Optional[bool] = None):
+        if source not in self.SOURCES:
+            raise ValueError(f"알 수 없는 메뉴 소스입니다: {source}")
         self.api_url = SCHOOL_MENU_API_URL
         self.school_code = SCHOOL_CODE
         self.website_url = SCHOOL_MENU_WEBSITE_URL
+        # 소스를 직접 지정했는데 URL이 없으면 샘플 데이터로 대체하지 않고 바로 실패 (auto만 샘플로 대체)
+        if source == 'api' and not self.api_url:
+            raise ValueError("--source api를 사용하려면 SCHOOL_MENU_API_URL을 설정하세요.")
+        if source == 'website' and not self.website_url:
+            raise ValueError("--source website를 사용하려면 SCHOOL_MENU_WEBSITE_URL을 설정하세요.")
+        self.source = source
+        self.low_memory = LOW_MEMORY_MODE
+        self.browser_backend = browser_backend or BROWSER_BACKEND
+        # True이면 get_menu_by_date 호출마다 프로파일을 PROFILE_DIR에 저장
+        self.profile = PROFILE_ENABLED if profile is None else profile
+        self.store = MenuStore()
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+    
+    @property
+    def session(self) -> requests.Session:
+        """API 요청용 세션 (keep-alive로 연결을 재사용, 처음 사용할 때 생성)"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(MENU_FETCH_WORKERS, 2))
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
     
     def get_today_menu(self) -> Dict[str, any]:
         """
@@ -58,59 +257,291 @@ class MenuFetcher:
         today = datetime.now(KST)
         return self.get_menu_by_date(today)
     
-    def get_menu_by_date(self, date: datetime) -> Dict[str, any]:
+    def get_menu_by_date(self, date: datetime, live: bool = False) -> Dict[str, any]:
         """
         특정 날짜의 급식 메뉴를 가져옵니다.
+        저장소에 MENU_STORE_TTL초 이내에 저장된 메뉴가 있으면 크롤링하지 않고 사용합니다.
+        profile이 켜져 있으면 호출 구간의 프로파일을 PROFILE_DIR에 저장합니다.
         
         Args:
             date: 날짜 객체
+            live: True이면 저장소를 건너뛰고 항상 새로 가져옴 (프리페처용)
             
         Returns:
             Dict: 메뉴 정보를 담은 딕셔너리
         """
         date_str = date.strftime("%Y-%m-%d")
+        if self.profile:
+            with RunProfiler(f"fetch-{date_str}"):
+                return self._resolve_menu(date_str, live)
+        return self._resolve_menu(date_str, live)
+    
+    def _resolve_menu(self, date_str: str, live: bool) -> Dict[str, any]:
+        """get_menu_by_date의 본체: 저장소 -> API -> 웹사이트 -> 샘플 순으로 메뉴를 찾습니다."""
+        # 샘플 소스가 지정되면 네트워크 없이 샘플 데이터 사용 (dry-run, 벤치마크용)
+        if self.source == 'sample':
+            return self._get_sample_menu(date_str)
+        
+        # 프리페처가 채워 둔 최근 메뉴가 있으면 바로 사용
+        if not live:
+            stored = self._get_fresh_from_store(date_str)
+            if stored is not None:
+                return stored
         
         # API가 설정되어 있으면 API에서 가져오기
-        if self.api_url:
+        if self.api_url and self.source in ('auto', 'api'):
             return self._fetch_from_api(date_str)
         
         # 웹사이트 URL이 설정되어 있으면 크롤링으로 가져오기
-        if self.website_url:
+        if self.website_url and self.source in ('auto', 'website'):
             return self._fetch_from_website(date_str)
         
-        # API가 없으면 샘플 데이터 반환 (실제 구현 시 학교 API로 교체)
+        # 소스가 auto이고 API/웹사이트가 모두 없으면 샘플 데이터 반환
+        if self.source != 'auto':
+            raise ValueError(f"메뉴 소스 '{self.source}'의 URL이 설정되지 않았습니다.")
         return self._get_sample_menu(date_str)
     
+    def _get_stored(self, date_str: str) -> Optional[Dict[str, any]]:
+        """저장된 메뉴를 반환합니다 (없거나 예전에 잘못 저장된 샘플 메뉴이면 None)."""
+        menu = self.store.get(date_str)
+        return None if is_sample_menu(menu) else menu
+    
+    def _get_fresh_from_store(self, date_str: str) -> Optional[Dict[str, any]]:
+        """저장된 지 MENU_STORE_TTL초가 지나지 않은 메뉴를 반환합니다 (없으면 None)."""
+        if MENU_STORE_TTL <= 0:
+            return None
+        stat = self.store.stat(date_str)
+        if stat is None or time.time() - stat[0] / 1e9 > MENU_STORE_TTL:
+            return None
+        menu = self._get_stored(date_str)
+        if menu is not None:
+            print(f"📦 저장된 메뉴 사용: {date_str}")
+        return menu
+    
+    def iter_menus(self, dates: Iterable[Union[datetime, str]],
+                   max_workers: Optional[int] = None, live: bool = False) -> Iterator[Dict[str, any]]:
+        """
+        여러 날짜의 메뉴를 가져오면서, 완료되는 순서대로 하나씩 돌려줍니다.
+        동시에 진행하는 날짜는 최대 max_workers개이며, 다음 날짜는 결과를
+        소비한 뒤에 시작하므로 날짜 수와 관계없이 메모리 사용량이 일정합니다.
+        
+        Args:
+            dates: 날짜 객체 또는 'YYYY-MM-DD' 문자열 목록 (제너레이터도 가능)
+            max_workers: 동시 크롤링 수 (기본값 MENU_FETCH_WORKERS)
+            live: True이면 저장소를 건너뛰고 항상 새로 가져옴
+            
+        Yields:
+            Dict: {'date': 'YYYY-MM-DD', 'menu': 메뉴 딕셔너리 또는 None,
+                   'error': None 또는 {'type': 예외 이름, 'message': 메시지}}
+        """
+        if self._use_api_batch():
+            yield from self._iter_menus_from_api_batch(dates)
+            return
+        
+        max_workers = max_workers or MENU_FETCH_WORKERS
+        date_iter = iter(dates)
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="menu-fetch")
+        pending = {}
+        
+        def submit_next() -> bool:
+            for date in date_iter:
+                if isinstance(date, str):
+                    date = datetime.strptime(date, "%Y-%m-%d")
+                pending[executor.submit(self.get_menu_by_date, date, live)] = date.strftime("%Y-%m-%d")
+                return True
+            return False
+        
+        try:
+            while len(pending) < max_workers and submit_next():
+                pass
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    date_str = pending.pop(future)
+                    try:
+                        result = {'date': date_str, 'menu': future.result(), 'error': None}
+                    except Exception as e:
+                        result = {'date': date_str, 'menu': None,
+                                  'error': {'type': type(e).__name__, 'message': str(e)}}
+                    yield result
+                    submit_next()
+        finally:
+            # 소비자가 중간에 멈추면 아직 시작하지 않은 날짜는 취소
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def _use_api_batch(self) -> bool:
+        """기간 조회 API를 사용할지 여부"""
+        return SCHOOL_MENU_API_BATCH and bool(self.api_url) and self.source in ('auto', 'api')
+    
+    @staticmethod
+    def _menu_from_api(date_str: str, data: Dict[str, any]) -> Dict[str, any]:
+        """API 응답 한 날짜분을 메뉴 딕셔너리로 변환합니다."""
+        return {
+            'date': date_str,
+            'breakfast': data.get('breakfast', []),
+            'lunch': data.get('lunch', []),
+            'dinner': data.get('dinner', [])
+        }
+    
+    def _conditional_get(self, params: Dict[str, str], validators_key: str,
+                         have_cached: bool) -> Optional[requests.Response]:
+        """
+        저장된 검증자로 조건부 GET을 보냅니다.
+        
+        Returns:
+            Response: 새 데이터가 있으면 응답, 변경이 없으면(304) None
+        """
+        headers = {}
+        if have_cached:
+            validators = self.store.get_validators(validators_key)
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        
+        response = self.session.get(self.api_url, params=params, headers=headers,
+                                    timeout=SCHOOL_MENU_API_TIMEOUT)
+        if response.status_code == 304 and have_cached:
+            return None
+        response.raise_for_status()
+        try:
+            self.store.put_validators(validators_key, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            })
+        except (OSError, ValueError) as e:
+            print(f"⚠️  검증자 저장 실패 (무시): {e}")
+        return response
+    
     def _fetch_from_api(self, date_str: str) -> Dict[str, any]:
-        """API에서 메뉴를 가져옵니다."""
+        """
+        API에서 메뉴를 가져옵니다.
+        저장된 메뉴가 있으면 조건부 요청을 보내고, 변경이 없으면(304) 저장된 메뉴를 사용합니다.
+        오류가 나면 저장된 메뉴, 그것도 없으면 샘플 데이터를 반환합니다 (source가 api이면 RuntimeError).
+        """
+        cached = self._get_stored(date_str)
         try:
             params = {
                 'date': date_str,
                 'school_code': self.school_code
             }
-            response = requests.get(self.api_url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            response = self._conditional_get(params, date_str, cached is not None)
+            if response is None:
+                print(f"✅ {date_str} 메뉴 변경 없음 (304)")
+                return cached
             
-            return {
-                'date': date_str,
-                'breakfast': data.get('breakfast', []),
-                'lunch': data.get('lunch', []),
-                'dinner': data.get('dinner', [])
-            }
+            menu = self._menu_from_api(date_str, response.json())
+            self._save_to_store(menu)
+            return menu
         except Exception as e:
             print(f"API에서 메뉴를 가져오는 중 오류 발생: {e}")
+            if cached is not None:
+                print("   저장된 메뉴를 사용합니다.")
+                return cached
+            # 소스를 api로 지정한 경우 샘플 데이터를 실제 메뉴처럼 보내지 않도록 실패 처리
+            if self.source != 'auto':
+                raise RuntimeError(f"❌ API에서 메뉴를 가져오지 못했습니다: {e}")
             return self._get_sample_menu(date_str)
     
+    def _fetch_range_from_api(self, date_strs: List[str]) -> Dict[str, Dict[str, any]]:
+        """
+        기간 조회 API로 여러 날짜의 메뉴를 한 번에 가져옵니다.
+        응답 형식은 {'menus': [...]}, 날짜별 객체 목록, 또는 날짜를 키로 하는 객체를 지원합니다.
+        
+        Returns:
+            Dict: 날짜 -> 메뉴 딕셔너리 (응답에 없는 날짜는 빠짐)
+        """
+        start, end = min(date_strs), max(date_strs)
+        cached = {date_str: self._get_stored(date_str) for date_str in date_strs}
+        have_cached = all(menu is not None for menu in cached.values())
+        params = {
+            'start': start,
+            'end': end,
+            'school_code': self.school_code
+        }
+        response = self._conditional_get(params, f"{start}_{end}", have_cached)
+        if response is None:
+            print(f"✅ {start}~{end} 메뉴 변경 없음 (304)")
+            return cached
+        
+        data = response.json()
+        if isinstance(data, dict) and 'menus' in data:
+            data = data['menus']
+        if isinstance(data, dict):
+            days = [dict(day, date=date_str) for date_str, day in data.items()]
+        else:
+            days = data
+        
+        menus = {}
+        for day in days:
+            date_str = day.get('date')
+            if date_str in cached:
+                menus[date_str] = self._menu_from_api(date_str, day)
+                self._save_to_store(menus[date_str])
+        return menus
+    
+    def _iter_menus_from_api_batch(self, dates: Iterable[Union[datetime, str]]) -> Iterator[Dict[str, any]]:
+        """
+        iter_menus의 기간 조회 API 버전: SCHOOL_MENU_API_BATCH_DAYS개씩 묶어 한 번에 요청합니다.
+        묶음 요청이 실패하거나 응답에 없는 날짜는 날짜별 요청으로 가져옵니다.
+        """
+        def flush(chunk: List[str]) -> Iterator[Dict[str, any]]:
+            try:
+                menus = self._fetch_range_from_api(chunk)
+            except Exception as e:
+                print(f"기간 조회 API 오류, 날짜별로 다시 요청합니다: {e}")
+                menus = {}
+            for date_str in chunk:
+                try:
+                    menu = menus.get(date_str) or self._fetch_from_api(date_str)
+                except Exception as e:
+                    yield {'date': date_str, 'menu': None, 'error': {'type': type(e).__name__, 'message': str(e)}}
+                    continue
+                yield {'date': date_str, 'menu': menu, 'error': None}
+        
+        chunk = []
+        for date in dates:
+            chunk.append(date if isinstance(date, str) else date.strftime("%Y-%m-%d"))
+            if len(chunk) >= SCHOOL_MENU_API_BATCH_DAYS:
+                yield from flush(chunk)
+                chunk = []
+        if chunk:
+            yield from flush(chunk)
+    
+    def _save_to_store(self, menu_data: Dict[str, any]):
+        """가져온 메뉴를 로컬 저장소에 기록합니다. 저장 실패는 전송을 막지 않습니다."""
+        try:
+            self.store.put(menu_data)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  메뉴 저장 실패 (무시): {e}")
+    
+    def _parse_html(self, html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        """
+        HTML을 파싱합니다.
+        저메모리 모드에서는 parse_only에 해당하는 부분만 트리로 만듭니다.
+        """
+        if self.low_memory and parse_only is not None:
+            return BeautifulSoup(html, 'html.parser', parse_only=parse_only)
+        return BeautifulSoup(html, 'html.parser')
+    
     def _fetch_from_website(self, date_str: str) -> Dict[str, any]:
         """
         학교 홈페이지에서 메뉴를 크롤링합니다.
         AngularJS로 동적 생성되는 페이지이므로 Selenium을 사용합니다.
+        BROWSER_BACKEND=cdp이면 CDP 백엔드(_fetch_from_website_cdp)를 사용합니다.
         """
+        if self.browser_backend == "cdp":
+            return self._fetch_from_website_cdp(date_str)
+        
+        started = time.perf_counter()
+        
         # ChromeDriverManager가 자동으로 Chrome을 감지하므로 별도 확인 불필요
         # Chrome이 없으면 ChromeDriverManager가 오류를 발생시킴
         
         driver = None
+        memory = MemoryMonitor(MEMORY_BUDGET_MB, MEMORY_BUDGET_ACTION)
         try:
             # 1. Chrome 옵션 설정
             chrome_options = Options()
@@ -124,18 +555,14 @@ class MenuFetcher:
                 print("🔧 Headless 모드 비활성화 (브라우저 창이 뜹니다)")
             
             # 서버 환경에서도 안정적으로 동작하도록 추가 옵션
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-software-rasterizer')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--ignore-certificate-errors')
-            chrome_options.add_argument('--ignore-ssl-errors')
-            chrome_options.add_argument('--ignore-certificate-errors-spki-list')
-            chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+            for arg in CHROME_ARGS:
+                chrome_options.add_argument(arg)
+            
+            # 저메모리 모드: 렌더러 프로세스를 하나로 제한하고 불필요한 기능 비활성화
+            if self.low_memory:
+                for arg in LOW_MEMORY_CHROME_ARGS:
+                    chrome_options.add_argument(arg)
+                print("🔧 저메모리 모드 활성화")
             
             # 2. ChromeDriver 자동 설치 및 설정
             # 운영체제에 따라 다르게 처리:
@@ -158,6 +585,12 @@ class MenuFetcher:
                 
                 # 페이지 로드 타임아웃 설정 (드라이버 생성 후)
                 driver.set_page_load_timeout(60)  # 60초
+                
+                # 브라우저 메모리 측정을 위해 chromedriver pid 등록 (Chrome은 그 하위 프로세스)
+                try:
+                    memory.attach_browser(driver.service.process.pid)
+                except AttributeError:
+                    pass
             except Exception as e:
                 error_msg = f"❌ Chrome/ChromeDriver 설정 실패: {e}"
                 print(error_msg)
@@ -204,31 +637,25 @@ class MenuFetcher:
             
             # 추가로 JavaScript 실행 완료 대기 (3초로 증가)
             time.sleep(3)
+            memory.sample("페이지 로드")
             
-            # 페이지 소스 가져오기
-            html = driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # 날짜 형식 변환 (YYYY-MM-DD -> YYYY.MM.DD)
-            date_formatted = datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y.%m.%d")
-            
-            # 현재 표시된 날짜 확인
-            current_date_element = soup.select_one(".nb-p-time-select-current")
-            if current_date_element:
-                current_date = current_date_element.get_text(strip=True)
-                print(f"현재 페이지 날짜: {current_date}, 요청 날짜: {date_formatted}")
+            # 요청 날짜로 이동 (포털은 오늘 날짜로 열림)
+            run_script = lambda script: driver.execute_script("return " + script)
+            self._go_to_date(date_str, run_script, lambda: time.sleep(2))
             
             # 메뉴 추출 함수 (식당별로 구조화)
             def extract_menu_from_tab():
                 """현재 활성화된 탭에서 식당별 메뉴를 추출"""
                 html = driver.page_source
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = self._parse_html(html, RESTAURANT_STRAINER)
+                del html
                 
                 # 식당별 메뉴를 저장할 딕셔너리
                 restaurant_menus = {}
                 
                 # 각 식당 (dl.nb-p-04-list-02)
                 restaurant_elements = soup.select("dl.nb-p-04-list-02")
+                expanded_soup = None
                 
                 for restaurant_elem in restaurant_elements:
                     # 식당 이름 추출 (dt 안의 span)
@@ -246,19 +673,23 @@ class MenuFetcher:
                     print(f"  식당 발견: {restaurant_name}, 코스 개수: {len(course_elements)}")
                     
                     # 식당이 접혀있을 수 있으므로 클릭하여 펼치기 시도
+                    # (메모리 예산 초과 시에는 펼치기와 재파싱을 생략하고 현재 트리만 사용)
                     try:
                         # Selenium으로 dt 클릭하여 메뉴 펼치기
                         # XPath를 사용하여 식당 이름이 포함된 dt 요소 찾기
                         dt_xpath = f"//dl[@class='nb-p-04-list-02']//dt[.//span[contains(text(), '{restaurant_name}')]]"
-                        dt_clickable = driver.find_element(By.XPATH, dt_xpath)
+                        dt_clickable = None if memory.over_budget else driver.find_element(By.XPATH, dt_xpath)
                         if dt_clickable:
                             dt_clickable.click()
                             time.sleep(0.5)  # 메뉴 펼쳐지는 시간 대기
-                            # 다시 HTML 파싱
+                            # 다시 HTML 파싱 (직전 식당용으로 만든 트리는 즉시 해제)
                             html = driver.page_source
-                            soup = BeautifulSoup(html, 'html.parser')
+                            if self.low_memory and expanded_soup is not None:
+                                expanded_soup.decompose()
+                            expanded_soup = self._parse_html(html, RESTAURANT_STRAINER)
+                            del html
                             # 해당 식당 요소 다시 찾기
-                            restaurant_elems = soup.select("dl.nb-p-04-list-02")
+                            restaurant_elems = expanded_soup.select("dl.nb-p-04-list-02")
                             for elem in restaurant_elems:
                                 name_elem = elem.select_one("dt span.ng-binding")
                                 if name_elem and restaurant_name in name_elem.get_text():
@@ -315,6 +746,11 @@ class MenuFetcher:
                     if menu_courses:
                         restaurant_menus[restaurant_name] = menu_courses
                 
+                if self.low_memory:
+                    soup.decompose()
+                    if expanded_soup is not None:
+                        expanded_soup.decompose()
+                memory.sample("메뉴 추출")
                 return restaurant_menus
             
             # 조식/중식/석식 탭을 각각 클릭하여 메뉴 추출
@@ -382,31 +818,19 @@ class MenuFetcher:
             # 메뉴가 하나도 없으면 기본적으로 중식 탭의 메뉴를 가져옴
             if not breakfast_menu and not lunch_menu and not dinner_menu:
                 print("⚠️  탭 클릭으로 메뉴를 가져올 수 없어 기본 방법으로 시도합니다.")
-                html = driver.page_source
-                soup = BeautifulSoup(html, 'html.parser')
                 # 기본적으로 중식 탭이 활성화되어 있으므로 중식 메뉴 추출
                 lunch_menu = extract_menu_from_tab()
             
-            # 메뉴가 없으면 에러 발생
-            if not breakfast_menu and not lunch_menu and not dinner_menu:
-                error_msg = "❌ 메뉴를 찾을 수 없습니다. 크롤링에 실패했습니다."
-                print(error_msg)
-                raise RuntimeError(error_msg)
-            
-            total_restaurants = len(set(list(breakfast_menu.keys()) + list(lunch_menu.keys()) + list(dinner_menu.keys())))
-            print(f"✅ 메뉴 추출 완료 - 총 {total_restaurants}개 식당")
-            
-            return {
-                'date': date_str,
-                'breakfast': breakfast_menu,
-                'lunch': lunch_menu,
-                'dinner': dinner_menu
-            }
+            shown_date = run_script(PORTAL_CURRENT_DATE_SCRIPT)
+            return self._build_website_menu(date_str, shown_date, breakfast_menu, lunch_menu, dinner_menu, started)
             
         except TimeoutException:
             error_msg = "❌ 페이지 로딩 시간 초과. 크롤링에 실패했습니다."
             print(error_msg)
             raise RuntimeError(error_msg)
+        except (MemoryBudgetExceeded, MenuDateMismatch) as e:
+            print(e)
+            raise
         except Exception as e:
             error_msg = f"❌ 웹사이트에서 메뉴를 가져오는 중 오류 발생: {e}"
             print(error_msg)
@@ -419,6 +843,153 @@ class MenuFetcher:
                     driver.quit()
                 except:
                     pass  # 이미 종료된 경우 무시
+            memory.report()
+    
+    def _go_to_date(self, date_str: str, run_script, settle):
+        """
+        포털 날짜 선택의 이전/다음 버튼을 눌러 요청 날짜로 이동합니다 (Selenium/CDP 공통).
+        오늘 메뉴는 포털이 기본으로 보여주므로 날짜 표시를 찾지 못하면 이동 없이 진행합니다.
+        
+        Args:
+            date_str: 'YYYY-MM-DD'
+            run_script: 페이지에서 JavaScript 식을 실행하고 결과를 반환하는 함수
+            settle: 날짜가 바뀐 뒤 메뉴가 다시 로드될 때까지 기다리는 함수
+            
+        Raises:
+            MenuDateMismatch: 날짜 표시나 이동 버튼을 찾지 못했거나 요청 날짜로 이동하지 못한 경우
+        """
+        target = datetime.strptime(date_str, "%Y-%m-%d")
+        shown_text = run_script(PORTAL_CURRENT_DATE_SCRIPT)
+        for _ in range(MAX_DATE_STEPS + 1):
+            shown = parse_portal_date(shown_text)
+            print(f"현재 페이지 날짜: {shown_text}, 요청 날짜: {date_str}")
+            if shown is None:
+                if self._is_today(date_str):
+                    print("⚠️  페이지에서 현재 날짜를 찾을 수 없어 기본(오늘) 페이지를 사용합니다.")
+                    return
+                raise MenuDateMismatch(f"❌ 페이지에서 현재 날짜를 찾을 수 없습니다: {shown_text!r}")
+            if shown == target:
+                return
+            if abs((target - shown).days) > MAX_DATE_STEPS:
+                raise MenuDateMismatch(f"❌ 요청 날짜가 페이지 날짜에서 {MAX_DATE_STEPS}일 넘게 떨어져 있습니다: {date_str}")
+            selector = PORTAL_DATE_NEXT_SELECTOR if target > shown else PORTAL_DATE_PREV_SELECTOR
+            if not run_script(PORTAL_DATE_STEP_SCRIPT % json.dumps(selector)):
+                raise MenuDateMismatch(f"❌ 날짜 이동 버튼을 찾을 수 없습니다: {selector}")
+            # 날짜 표시가 바뀔 때까지 대기
+            deadline = time.monotonic() + 10
+            new_text = shown_text
+            while new_text == shown_text and time.monotonic() < deadline:
+                time.sleep(0.2)
+                new_text = run_script(PORTAL_CURRENT_DATE_SCRIPT)
+            if new_text == shown_text:
+                raise MenuDateMismatch("❌ 날짜 이동 후에도 페이지 날짜가 바뀌지 않았습니다.")
+            shown_text = new_text
+            settle()
+        raise MenuDateMismatch(f"❌ 요청 날짜로 이동하지 못했습니다: {date_str} (현재 {shown_text})")
+    
+    @staticmethod
+    def _is_today(date_str: str) -> bool:
+        return date_str == datetime.now(KST).strftime("%Y-%m-%d")
+    
+    def _build_website_menu(self, date_str: str, shown_date: Optional[str], breakfast_menu: Dict[str, any],
+                            lunch_menu: Dict[str, any], dinner_menu: Dict[str, any], started: float) -> Dict[str, any]:
+        """
+        크롤링한 식사별 메뉴를 하나로 묶어 저장하고 반환합니다 (Selenium/CDP 공통).
+        오늘이 아닌 날짜는 추출을 마친 시점에 페이지에 표시된 날짜(shown_date)가 요청 날짜와 다르면 저장하지 않습니다.
+        """
+        if parse_portal_date(shown_date) != datetime.strptime(date_str, "%Y-%m-%d"):
+            if not self._is_today(date_str):
+                raise MenuDateMismatch(f"❌ 페이지 날짜({shown_date})가 요청 날짜({date_str})와 달라 저장하지 않습니다.")
+            print(f"⚠️  페이지 날짜({shown_date})가 요청 날짜와 일치하는지 확인하지 못했지만 오늘 메뉴로 사용합니다.")
+        
+        # 메뉴가 없으면 에러 발생
+        if not breakfast_menu and not lunch_menu and not dinner_menu:
+            error_msg = "❌ 메뉴를 찾을 수 없습니다. 크롤링에 실패했습니다."
+            print(error_msg)
+            raise RuntimeError(error_msg)
+        
+        total_restaurants = len(set(list(breakfast_menu.keys()) + list(lunch_menu.keys()) + list(dinner_menu.keys())))
+        print(f"✅ 메뉴 추출 완료 - 총 {total_restaurants}개 식당")
+        print(f"⏱️  크롤링 소요 시간 ({self.browser_backend}): {time.perf_counter() - started:.2f}초")
+        
+        menu = {
+            'date': date_str,
+            'breakfast': breakfast_menu,
+            'lunch': lunch_menu,
+            'dinner': dinner_menu
+        }
+        self._save_to_store(menu)
+        return menu
+    
+    def _fetch_from_website_cdp(self, date_str: str) -> Dict[str, any]:
+        """
+        Chrome DevTools Protocol로 학교 홈페이지에서 메뉴를 크롤링합니다.
+        WebDriver 명령마다 생기는 HTTP 왕복 대신, 식사 탭마다 탭 클릭과
+        식당 펼치기/메뉴 추출을 각각 한 번의 스크립트 실행으로 처리합니다.
+        """
+        started = time.perf_counter()
+        memory = MemoryMonitor(MEMORY_BUDGET_MB, MEMORY_BUDGET_ACTION)
+        chrome_args = CHROME_ARGS + (LOW_MEMORY_CHROME_ARGS if self.low_memory else [])
+        try:
+            print("🔍 CDP 백엔드로 Chrome 실행 중...")
+            with CDPBrowser(chrome_args, headless=SELENIUM_HEADLESS, binary=CHROME_BINARY) as browser:
+                memory.attach_browser(browser.pid)
+                
+                print(f"🌐 페이지 접속 중: {self.website_url}")
+                browser.navigate(self.website_url)
+                
+                # 메뉴 컨테이너가 DOM에 나타날 때까지 대기 (MutationObserver 이벤트 기반)
+                print("🔍 메뉴 컨테이너 찾는 중...")
+                if browser.wait_for_selector(".nb-p-04-content", timeout=30):
+                    print("✅ 메뉴 컨테이너 발견")
+                else:
+                    print("⚠️  기본 컨테이너를 찾지 못함. 네트워크 유휴 상태까지 대기합니다.")
+                browser.wait_for_network_idle(timeout=15)
+                memory.sample("페이지 로드")
+                
+                # 요청 날짜로 이동 (포털은 오늘 날짜로 열림)
+                self._go_to_date(date_str, browser.evaluate, lambda: browser.wait_for_network_idle(timeout=20))
+                
+                # 메모리 예산 초과(degrade)이면 식당 펼치기를 생략 (Selenium 경로와 동일)
+                extract_script = lambda: CDP_EXTRACT_MENU_SCRIPT % ('false' if memory.over_budget else 'true')
+                meals = {}
+                for meal, label in (('breakfast', '조식'), ('lunch', '중식'), ('dinner', '석식')):
+                    print(f"🔘 {label} 탭 클릭 중...")
+                    if not browser.evaluate(CDP_CLICK_TAB_SCRIPT % json.dumps(label)):
+                        print(f"⚠️  {label} 탭을 찾을 수 없습니다")
+                        meals[meal] = {}
+                        continue
+                    # 탭 전환으로 발생한 요청이 끝날 때까지 이벤트로 대기
+                    browser.wait_for_network_idle(timeout=20)
+                    meals[meal] = browser.evaluate(extract_script()) or {}
+                    memory.sample("메뉴 추출")
+                    total_courses = sum(len(courses) for courses in meals[meal].values())
+                    print(f"✅ {label} 메뉴: {len(meals[meal])}개 식당, {total_courses}개 코스")
+                
+                # 메뉴가 하나도 없으면 기본적으로 활성화된 중식 탭의 메뉴를 가져옴 (Selenium과 동일)
+                if not any(meals.values()):
+                    print("⚠️  탭 클릭으로 메뉴를 가져올 수 없어 기본 방법으로 시도합니다.")
+                    meals['lunch'] = browser.evaluate(extract_script()) or {}
+                shown_date = browser.evaluate(PORTAL_CURRENT_DATE_SCRIPT)
+            
+            return self._build_website_menu(date_str, shown_date, meals['breakfast'], meals['lunch'],
+                                            meals['dinner'], started)
+        except (MemoryBudgetExceeded, MenuDateMismatch) as e:
+            print(e)
+            raise
+        except CDPError as e:
+            error_msg = f"❌ CDP 백엔드 크롤링 실패: {e}"
+            print(error_msg)
+            raise RuntimeError(error_msg)
+        except Exception as e:
+            # 웹소켓 오류, /json/list 접속 실패(URLError), Chrome 실행 실패(OSError) 등도 Selenium 경로와 같이 감쌈
+            error_msg = f"❌ 웹사이트에서 메뉴를 가져오는 중 오류 발생: {e}"
+            print(error_msg)
+            import traceback
+            traceback.print_exc()
+            raise RuntimeError(error_msg)
+        finally:
+            memory.report()
     
     def _get_sample_menu(self, date_str: str) -> Dict[str, any]:
         """
@@ -469,6 +1040,8 @@ class MenuFetcher:
         # 샘플 데이터도 식당별로 구조화 (실제 학교 식당 구조 반영)
         return {
             'date': date_str,
+            # 실제 소스의 메뉴가 아님을 표시 (저장소에는 기록하지 않음)
+            'sample': True,
             'breakfast': {
                 '참슬기식당(310관 B4층)': [{
                     'time': '07:00~09:00',
@@ -566,34 +1139,6 @@ class MenuFetcher:
         
         message = f"📅 {month_day}({weekday}) 오늘의 급식\n\n"
         
-        # 식당 이름을 간단하게 변환하는 함수
-        def simplify_restaurant_name(name: str) -> str:
-            """식당 이름을 간단하게 변환"""
-            # 308관, 309관, 310관, 303관 등 추출
-            if '308관' in name or '블루미르308관' in name:
-                return '308관'
-            elif '309관' in name or '블루미르309관' in name:
-                return '309관'
-            elif '310관' in name or 'B4층' in name:
-                return '310관 B4'
-            elif '303관' in name or 'B1층' in name:
-                return '303관 B1'
-            elif '102관' in name or 'University Club' in name:
-                return '102관'
-            return name
-        
-        # 코스명 정리 함수
-        def clean_course_name(course_name: str) -> str:
-            """코스명을 간단하게 정리"""
-            if not course_name:
-                return ""
-            # 괄호 제거 및 정리
-            course = course_name.replace('조식(', '').replace('중식(', '').replace('석식(', '').replace(')', '')
-            # 불필요한 단어 제거
-            if course in ['조식', '중식', '석식', '한식']:
-                return ""
-            return course
-        
         # 조식 포맷팅
         breakfast_found = False
         breakfast_times = []
@@ -663,21 +1208,9 @@ class MenuFetcher:
                 
                 message += f"*🍴 중식{(' ' + time_range) if time_range else ''}*\n"
                 
-                # 우선순위 식당 및 가격 정의
-                # 303관 B1 (5,500원)을 가장 앞으로
-                priority_restaurants = [
-                    ('303관 B1', '5,500'),
-                    ('310관 B4', '4,000'),
-                    ('310관 B4', '5,500'),
-                    ('308관', '5,500')
-                ]
-                
-                # 303관 B1 (5,500원) 메뉴를 별도로 분리하여 가장 앞에 배치
-                top_priority_items = []
-                
-                # 메뉴를 우선순위와 일반으로 분리
-                priority_items = []
-                regular_items = []
+                # 우선순위 그룹별로 메뉴를 분리 (순위는 menu_rules.json의 lunch_priority)
+                # 마지막 그룹은 우선순위가 없는 일반 메뉴
+                ranked_items = [[] for _ in range(RULES.default_rank + 1)]
                 
                 for restaurant_name, courses in menu_data['lunch'].items():
                     if not courses:
@@ -696,22 +1229,11 @@ class MenuFetcher:
                         course_prefix = f"{course_name} " if course_name else ""
                         menu_line = f"- {simple_name} ({price_str}원) : {course_prefix}{menu_text}\n"
                         
-                        # 303관 B1 (5,500원)을 가장 앞으로
-                        if simple_name == '303관 B1' and price_str == '5,500':
-                            top_priority_items.append(menu_line)
-                        # 나머지 우선순위 확인
-                        elif (simple_name, price_str) in priority_restaurants:
-                            priority_items.append(menu_line)
-                        else:
-                            regular_items.append(menu_line)
+                        ranked_items[RULES.lunch_rank(simple_name, price_str)].append(menu_line)
                 
-                # 출력 순서: 303관 B1 (5,500원) -> 나머지 우선순위 -> 일반 메뉴
-                for item in top_priority_items:
-                    message += item
-                for item in priority_items:
-                    message += item
-                for item in regular_items:
-                    message += item
+                # 출력 순서: 우선순위 그룹 순 (기본 설정: 303관 B1 (5,500원) -> 나머지 우선순위 -> 일반 메뉴)
+                for items in ranked_items:
+                    message += "".join(items)
                 
                 if not lunch_found:
                     message += "- (메뉴 없음)\n"
@@ -0,0 +1,144 @@
+"""
+앞으로 N일치 메뉴를 미리 가져와 로컬 저장소를 최신 상태로 유지하는 모듈
+전송 시점에는 get_today_menu가 저장소에서 바로 메뉴를 읽을 수 있습니다.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from config import PREFETCH_DAYS, PREFETCH_INTERVAL, PREFETCH_JITTER
+from menu_fetcher import MenuFetcher, MenuDateMismatch, KST
+
+# 직전 새로고침에서 내용이 바뀐 날짜는 이 비율의 주기로 더 자주 다시 확인
+CHANGED_INTERVAL_RATIO = 0.25
+
+
+def content_hash(menu_data: Optional[Dict[str, any]]) -> Optional[str]:
+    """메뉴 내용 해시 (키 순서와 무관)"""
+    if menu_data is None:
+        return None
+    canonical = json.dumps(menu_data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MenuPrefetcher:
+    """
+    오늘부터 days일 동안의 메뉴를 주기적으로 새로고침하는 클래스
+
+    - 날짜마다 다음 새로고침 시각을 관리하며, 주기에 지터를 더해 요청이 몰리지 않게 합니다.
+    - 새로 가져온 메뉴의 내용 해시가 바뀐 날짜는 더 짧은 주기로 다시 가져옵니다.
+    - 웹사이트 소스는 포털에 표시된 날짜가 요청 날짜와 같을 때만 저장합니다 (MenuDateMismatch).
+    - start()로 백그라운드 스레드에서 실행하거나 refresh_due()를 직접 호출할 수 있습니다.
+    """
+
+    def __init__(self, fetcher: Optional[MenuFetcher] = None, days: int = PREFETCH_DAYS,
+                 interval: float = PREFETCH_INTERVAL, jitter: float = PREFETCH_JITTER,
+                 max_workers: int = 1):
+        self.fetcher = fetcher or MenuFetcher()
+        self.store = self.fetcher.store
+        self.days = days
+        self.interval = interval
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self._next_due: Dict[str, float] = {}
+        self._hashes: Dict[str, Optional[str]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def window(self) -> List[str]:
+        """미리 가져올 날짜 목록 (오늘 KST부터 days일)"""
+        today = datetime.now(KST).date()
+        return [(today + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(self.days)]
+
+    def _delay(self, base: float) -> float:
+        """기본 간격에 0~jitter 비율만큼 무작위 시간을 더합니다."""
+        return base * (1 + random.uniform(0, self.jitter))
+
+    def refresh_due(self, force: bool = False) -> Dict[str, str]:
+        """
+        새로고침 시각이 된 날짜를 가져옵니다.
+
+        Args:
+            force: True이면 모든 날짜를 새로고침
+
+        Returns:
+            Dict: 날짜 -> 'new' | 'changed' | 'unchanged' | 'error'
+        """
+        now = time.monotonic()
+        window = self.window()
+        # 범위를 벗어난 지난 날짜는 정리
+        for date_str in list(self._next_due):
+            if date_str not in window:
+                self._next_due.pop(date_str, None)
+                self._hashes.pop(date_str, None)
+
+        due = [d for d in window if force or self._next_due.get(d, 0) <= now]
+        if not due:
+            return {}
+
+        for date_str in due:
+            if date_str not in self._hashes:
+                self._hashes[date_str] = content_hash(self.store.get(date_str))
+
+        statuses = {}
+        # 가져온 메뉴는 MenuFetcher가 저장소에 기록함
+        for result in self.fetcher.iter_menus(due, max_workers=self.max_workers, live=True):
+            date_str = result['date']
+            if result['error']:
+                statuses[date_str] = 'error'
+                # 실패한 날짜는 조금 뒤에 다시 시도. 단, 포털에서 해당 날짜로 이동하지 못한 경우는
+                # 곧바로 다시 시도해도 같은 결과이므로 (브라우저만 반복 실행됨) 평소 주기로 미룸
+                retry = 1 if result['error']['type'] == MenuDateMismatch.__name__ else CHANGED_INTERVAL_RATIO
+                self._next_due[date_str] = time.monotonic() + self._delay(self.interval * retry)
+                continue
+            new_hash = content_hash(result['menu'])
+            old_hash = self._hashes.get(date_str)
+            if old_hash is None:
+                statuses[date_str] = 'new'
+            elif old_hash != new_hash:
+                statuses[date_str] = 'changed'
+            else:
+                statuses[date_str] = 'unchanged'
+            self._hashes[date_str] = new_hash
+            base = self.interval * (CHANGED_INTERVAL_RATIO if statuses[date_str] == 'changed' else 1)
+            self._next_due[date_str] = time.monotonic() + self._delay(base)
+
+        summary = ", ".join(f"{d}: {s}" for d, s in sorted(statuses.items()))
+        print(f"🔄 프리페치 완료 - {summary}")
+        return statuses
+
+    def seconds_until_next(self) -> float:
+        """다음 새로고침까지 남은 시간(초)"""
+        pending = [self._next_due.get(d, 0) for d in self.window()]
+        return max(0.0, min(pending) - time.monotonic()) if pending else self.interval
+
+    def run_forever(self):
+        """stop()이 호출될 때까지 새로고침을 반복합니다."""
+        # 여러 러너가 동시에 시작해도 포털에 요청이 몰리지 않도록 첫 실행도 지터만큼 지연
+        if self._stop.wait(random.uniform(0, self.jitter * min(self.interval, 60))):
+            return
+        while not self._stop.is_set():
+            try:
+                self.refresh_due()
+            except Exception as e:
+                print(f"⚠️  프리페치 중 오류 발생 (계속 진행): {e}")
+            # 날짜가 바뀌는 시점도 놓치지 않도록 최대 대기 시간 제한
+            self._stop.wait(min(max(self.seconds_until_next(), 1.0), self.interval))
+
+    def start(self) -> "MenuPrefetcher":
+        """백그라운드 스레드에서 새로고침을 시작합니다."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name="menu-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """백그라운드 새로고침을 멈춥니다 (진행 중인 크롤링은 끝날 때까지 기다림)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
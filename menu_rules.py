@@ -0,0 +1,81 @@
+"""
+식당 이름 정규화, 코스명 정리, 중식 정렬 순서 규칙을 설정 파일에서 읽어오는 모듈
+
+규칙은 시작할 때 한 번 컴파일되고(정규식, 순위 맵), 원본 이름별 결과는 메모이즈되므로
+메시지를 렌더링할 때 줄마다 같은 문자열 처리를 반복하지 않습니다.
+캠퍼스/식당을 추가할 때는 menu_rules.json(MENU_RULES_PATH)만 수정하면 됩니다.
+"""
+import json
+import re
+from typing import Dict, List, Tuple
+from config import MENU_RULES_PATH
+
+
+class MenuRules:
+    """
+    컴파일된 메뉴 표시 규칙
+
+    설정 형식:
+        restaurant_names: [{"name": 표시 이름, "match": [포함 문자열, ...]}, ...]
+                          (위에서부터 처음 일치하는 규칙 사용, 없으면 원래 이름)
+        course_remove:    코스명에서 제거할 문자열 목록
+        course_drop:      제거 후 이 값이면 코스명을 표시하지 않음
+        lunch_priority:   [[[표시 이름, 가격], ...], ...] 그룹 순서대로 중식 상단에 배치
+    """
+
+    def __init__(self, rules: Dict[str, any]):
+        self._name_patterns: List[Tuple["re.Pattern", str]] = [
+            (re.compile("|".join(re.escape(text) for text in rule['match'])), rule['name'])
+            for rule in rules.get('restaurant_names', [])
+            if rule.get('match')
+        ]
+        remove = rules.get('course_remove', [])
+        self._course_pattern = re.compile("|".join(re.escape(text) for text in remove)) if remove else None
+        self._course_drop = frozenset(rules.get('course_drop', []))
+        self._rank: Dict[Tuple[str, str], int] = {}
+        groups = rules.get('lunch_priority', [])
+        for rank, group in enumerate(groups):
+            for name, price in group:
+                self._rank.setdefault((name, price), rank)
+        # 우선순위 그룹에 없는 항목의 순위
+        self.default_rank = len(groups)
+        self._name_cache: Dict[str, str] = {}
+        self._course_cache: Dict[str, str] = {}
+
+    @classmethod
+    def from_file(cls, path: str) -> "MenuRules":
+        """JSON 설정 파일에서 규칙을 읽어 컴파일합니다."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def simplify_restaurant_name(self, name: str) -> str:
+        """식당 이름을 간단하게 변환"""
+        simple = self._name_cache.get(name)
+        if simple is None:
+            simple = name
+            for pattern, display_name in self._name_patterns:
+                if pattern.search(name):
+                    simple = display_name
+                    break
+            self._name_cache[name] = simple
+        return simple
+
+    def clean_course_name(self, course_name: str) -> str:
+        """코스명을 간단하게 정리"""
+        if not course_name:
+            return ""
+        course = self._course_cache.get(course_name)
+        if course is None:
+            course = self._course_pattern.sub("", course_name) if self._course_pattern else course_name
+            if course in self._course_drop:
+                course = ""
+            self._course_cache[course_name] = course
+        return course
+
+    def lunch_rank(self, simple_name: str, price: str) -> int:
+        """중식 정렬 순위 (작을수록 앞, 우선순위 없으면 default_rank)"""
+        return self._rank.get((simple_name, price), self.default_rank)
+
+
+# 시작할 때 한 번만 컴파일
+RULES = MenuRules.from_file(MENU_RULES_PATH)
@@ -0,0 +1,233 @@
+"""
+저장된 메뉴 데이터를 HTTP(JSON/텍스트)로 제공하는 읽기 전용 서버
+요청 처리 중에는 크롤링하지 않고 로컬 저장소만 읽습니다.
+
+엔드포인트:
+    GET /menu/{YYYY-MM-DD}            메뉴 JSON
+    GET /menu/today                   오늘(KST) 메뉴 JSON
+    GET /menu/{YYYY-MM-DD}/text       Slack 메시지 형식 텍스트
+    GET /menu/{YYYY-MM-DD}/blocks     Slack Block Kit JSON
+    GET /menu/range?start=...&end=... 기간 메뉴 JSON (최대 31일)
+"""
+import argparse
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+from config import MENU_SERVER_HOST, MENU_SERVER_PORT
+from menu_fetcher import MenuFetcher, KST
+from menu_store import MenuStore
+from render_cache import RenderCache
+
+# 기간 조회 시 허용하는 최대 일수
+MAX_RANGE_DAYS = 31
+# 메모리에 유지할 최대 응답 수 (가장 오래 사용하지 않은 것부터 제거)
+MAX_CACHED_PAYLOADS = 1024
+
+
+class Payload:
+    """미리 직렬화된 응답 본문과 조건부 요청용 검증자(ETag, Last-Modified)"""
+
+    __slots__ = ("stamp", "body", "content_type", "etag", "last_modified", "mtime")
+
+    def __init__(self, stamp, body: bytes, content_type: str, mtime: float):
+        self.stamp = stamp
+        self.body = body
+        self.content_type = content_type
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        # HTTP 날짜는 초 단위이므로 비교도 초 단위로 맞춤
+        self.mtime = int(mtime)
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+
+
+class MenuServer:
+    """
+    저장소의 메뉴를 응답 본문으로 직렬화하여 캐싱하는 클래스
+    저장 파일의 (수정 시각, 크기)가 바뀌었을 때만 다시 직렬화합니다.
+    캐시는 최근 사용 순(LRU)으로 MAX_CACHED_PAYLOADS개까지만 유지합니다.
+    """
+
+    def __init__(self, store: Optional[MenuStore] = None, fetcher: Optional[MenuFetcher] = None):
+        self.store = store or MenuStore()
+        self.fetcher = fetcher or MenuFetcher()
+        self.render_cache = RenderCache(self.store, self.fetcher)
+        self._payloads: "OrderedDict[Tuple[str, ...], Payload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key: Tuple[str, ...], stamp, mtime_ns: int,
+                build: Callable[[], Tuple[bytes, str]], cache: bool = True) -> Payload:
+        """stamp가 같으면 캐시된 Payload를, 다르면 새로 만들어 반환합니다 (cache가 False이면 저장하지 않음)."""
+        with self._lock:
+            payload = self._payloads.get(key)
+            if payload is not None and payload.stamp == stamp:
+                self._payloads.move_to_end(key)
+                return payload
+        body, content_type = build()
+        payload = Payload(stamp, body, content_type, mtime_ns / 1e9)
+        if cache:
+            with self._lock:
+                self._payloads[key] = payload
+                self._payloads.move_to_end(key)
+                while len(self._payloads) > MAX_CACHED_PAYLOADS:
+                    self._payloads.popitem(last=False)
+        return payload
+
+    @staticmethod
+    def _json(data) -> Tuple[bytes, str]:
+        return json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+
+    def menu(self, date_str: str) -> Optional[Payload]:
+        """특정 날짜 메뉴 JSON (저장된 메뉴가 없으면 None)"""
+        stamp = self.store.stat(date_str)
+        if stamp is None:
+            return None
+        return self._cached(("menu", date_str), stamp, stamp[0], lambda: self._json(self.store.get(date_str)))
+
+    def rendered(self, date_str: str, fmt: str) -> Optional[Payload]:
+        """특정 날짜 메뉴의 렌더링 결과 (fmt: 'text' 또는 'blocks', 렌더링 캐시 사용)"""
+        stamp = self.store.stat(date_str)
+        if stamp is None:
+            return None
+
+        def build():
+            rendered = self.render_cache.render(self.store.get(date_str), fmt)
+            if fmt == 'text':
+                return rendered.encode("utf-8"), "text/plain; charset=utf-8"
+            return self._json({'blocks': rendered})
+
+        return self._cached((fmt, date_str), stamp, stamp[0], build)
+
+    def range(self, start: str, end: str) -> Payload:
+        """
+        기간 메뉴 JSON ({'start', 'end', 'menus': [...]}), 저장되지 않은 날짜는 제외
+        저장된 날짜가 하나도 없는 기간은 캐시하지 않습니다.
+        """
+        dates = MenuStore.date_range(start, end, max_days=MAX_RANGE_DAYS)
+        stamp = tuple(self.store.stat(d) for d in dates)
+
+        def build():
+            menus = [m for m in (self.store.get(d) for d in dates) if m]
+            return self._json({'start': start, 'end': end, 'menus': menus})
+
+        mtime_ns = max((s[0] for s in stamp if s), default=0)
+        return self._cached(("range", start, end), stamp, mtime_ns, build, cache=any(stamp))
+
+
+class MenuRequestHandler(BaseHTTPRequestHandler):
+    """메뉴 조회 요청 핸들러"""
+
+    server_version = "TodayMenu/1.0"
+    menu_server: MenuServer = None
+
+    def log_message(self, format, *args):
+        # 높은 요청률에서 콘솔 출력이 병목이 되지 않도록 로그 생략
+        pass
+
+    def _send_error(self, status: int, message: str):
+        body = json.dumps({'error': message}, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, payload: Payload) -> bool:
+        """If-None-Match / If-Modified-Since 조건을 확인합니다."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            # If-None-Match는 약한 비교를 사용하므로 W/ 접두사를 떼고 비교
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            tags = [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+            return payload.etag in tags or "*" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= payload.mtime
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send_payload(self, payload: Payload, head_only: bool = False):
+        if self._not_modified(payload):
+            self.send_response(304)
+            self.send_header("ETag", payload.etag)
+            self.send_header("Last-Modified", payload.last_modified)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", payload.content_type)
+        self.send_header("Content-Length", str(len(payload.body)))
+        self.send_header("ETag", payload.etag)
+        self.send_header("Last-Modified", payload.last_modified)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(payload.body)
+
+    def _handle(self, head_only: bool = False):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        if not parts or parts[0] != "menu" or len(parts) > 3:
+            return self._send_error(404, "not found")
+
+        try:
+            if len(parts) == 2 and parts[1] == "range":
+                query = parse_qs(url.query)
+                start = datetime.strptime(query.get("start", [""])[0], "%Y-%m-%d")
+                end = datetime.strptime(query.get("end", [""])[0], "%Y-%m-%d")
+                # 날짜 목록을 만들기 전에 기간 길이부터 확인 (아주 긴 기간으로 CPU를 점유하지 못하도록)
+                days = (end - start).days
+                if not 0 <= days < MAX_RANGE_DAYS:
+                    return self._send_error(400, f"range must be 1~{MAX_RANGE_DAYS} days")
+                payload = self.menu_server.range(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+            else:
+                if len(parts) == 1 or (len(parts) == 3 and parts[2] not in RenderCache.FORMATS):
+                    return self._send_error(404, "not found")
+                date_str = parts[1]
+                if date_str == "today":
+                    date_str = datetime.now(KST).strftime("%Y-%m-%d")
+                # '2024-3-4'처럼 0이 빠진 날짜도 저장소 파일 이름 형식으로 맞춤
+                date_str = datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y-%m-%d")
+                if len(parts) == 3:
+                    payload = self.menu_server.rendered(date_str, parts[2])
+                else:
+                    payload = self.menu_server.menu(date_str)
+        except ValueError:
+            return self._send_error(400, "date must be YYYY-MM-DD")
+
+        if payload is None:
+            return self._send_error(404, "menu not found")
+        self._send_payload(payload, head_only)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_HEAD(self):
+        self._handle(head_only=True)
+
+
+def serve(host: str = MENU_SERVER_HOST, port: int = MENU_SERVER_PORT, store: Optional[MenuStore] = None):
+    """메뉴 HTTP 서버를 실행합니다 (Ctrl+C로 종료)."""
+    handler = type("BoundMenuRequestHandler", (MenuRequestHandler,), {"menu_server": MenuServer(store)})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    print(f"🌐 메뉴 서버 실행 중: http://{host}:{port}/menu/today")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장된 메뉴를 제공하는 읽기 전용 HTTP 서버")
+    parser.add_argument("--host", default=MENU_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=MENU_SERVER_PORT)
+    args = parser.parse_args()
+    serve(args.host, args.port)
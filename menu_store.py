@@ -0,0 +1,146 @@
+"""
+크롤링한 메뉴를 날짜별 JSON 파일로 저장하고 읽어오는 모듈
+"""
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from config import MENU_STORE_DIR
+
+
+def write_json_atomic(path: str, data):
+    """임시 파일에 쓴 뒤 교체하여 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 합니다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def is_sample_menu(menu_data: Optional[Dict[str, any]]) -> bool:
+    """MenuFetcher가 실제 소스 대신 돌려준 샘플 데이터인지 여부"""
+    return bool(menu_data and menu_data.get('sample'))
+
+
+class MenuStore:
+    """날짜별 메뉴 데이터를 로컬 디렉터리에 저장하는 클래스"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or MENU_STORE_DIR
+        self.menu_dir = os.path.join(self.directory, "menus")
+
+    def _menu_path(self, date_str: str) -> str:
+        """날짜에 해당하는 메뉴 파일 경로를 반환합니다."""
+        # 경로 조작 방지를 위해 날짜 형식 검증
+        datetime.strptime(date_str, "%Y-%m-%d")
+        return os.path.join(self.menu_dir, f"{date_str}.json")
+
+    def put(self, menu_data: Dict[str, any]):
+        """
+        메뉴 데이터를 저장합니다.
+
+        Args:
+            menu_data: 'date' 키를 포함한 메뉴 정보 딕셔너리 (샘플 데이터는 ValueError)
+        """
+        if is_sample_menu(menu_data):
+            raise ValueError(f"샘플 메뉴는 저장하지 않습니다: {menu_data['date']}")
+        write_json_atomic(self._menu_path(menu_data['date']), menu_data)
+
+    def get(self, date_str: str) -> Optional[Dict[str, any]]:
+        """
+        저장된 메뉴를 가져옵니다.
+
+        Returns:
+            Dict: 메뉴 정보 딕셔너리 (없으면 None)
+        """
+        try:
+            with open(self._menu_path(date_str), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _validators_path(self, key: str) -> str:
+        # 키는 날짜 또는 'YYYY-MM-DD_YYYY-MM-DD' 형식만 허용
+        for part in key.split("_"):
+            datetime.strptime(part, "%Y-%m-%d")
+        return os.path.join(self.directory, "validators", f"{key}.json")
+
+    def get_validators(self, key: str) -> Dict[str, str]:
+        """
+        조건부 요청에 사용할 검증자(ETag, Last-Modified)를 가져옵니다.
+
+        Args:
+            key: 날짜 또는 기간 ('YYYY-MM-DD_YYYY-MM-DD')
+        """
+        try:
+            with open(self._validators_path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def put_validators(self, key: str, validators: Dict[str, str]):
+        """응답의 검증자를 저장합니다 (값이 모두 없으면 이전 검증자를 삭제)."""
+        validators = {name: value for name, value in validators.items() if value}
+        if validators:
+            write_json_atomic(self._validators_path(key), validators)
+            return
+        # 예전 검증자가 남아 있으면 바뀐 응답에 대해 잘못된 304를 받을 수 있음
+        try:
+            os.remove(self._validators_path(key))
+        except FileNotFoundError:
+            pass
+
+    def stat(self, date_str: str) -> Optional[Tuple[int, int]]:
+        """
+        저장된 메뉴 파일의 (수정 시각(ns), 크기)를 반환합니다.
+        파일이 바뀌었는지 빠르게 확인하는 용도로 사용합니다.
+        """
+        try:
+            st = os.stat(self._menu_path(date_str))
+        except (OSError, ValueError):
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def dates(self) -> List[str]:
+        """저장된 모든 날짜를 정렬하여 반환합니다."""
+        try:
+            names = os.listdir(self.menu_dir)
+        except OSError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".json"))
+
+    def archive(self, results: Iterable[Dict[str, any]]) -> Iterator[Dict[str, any]]:
+        """
+        MenuFetcher.iter_menus의 결과 스트림을 받아 성공한 메뉴를 도착하는 즉시 저장하고,
+        결과를 그대로 다음 소비자(예: WebhookSender)에게 넘겨줍니다.
+        샘플 데이터와, MenuFetcher가 이미 저장한 것과 같은 메뉴는 기록하지 않습니다.
+        """
+        for result in results:
+            menu_data = result.get('menu')
+            if menu_data and not is_sample_menu(menu_data) and self.get(menu_data['date']) != menu_data:
+                try:
+                    self.put(menu_data)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  메뉴 저장 실패 (무시): {e}")
+            yield result
+
+    @staticmethod
+    def date_range(start: str, end: str, max_days: Optional[int] = None) -> List[str]:
+        """
+        start~end(포함) 사이의 날짜 문자열 목록을 반환합니다.
+        시작일이 종료일보다 늦거나 max_days를 넘는 기간이면 목록을 만들기 전에 ValueError를 발생시킵니다.
+        """
+        start_date = datetime.strptime(start, "%Y-%m-%d")
+        end_date = datetime.strptime(end, "%Y-%m-%d")
+        days = (end_date - start_date).days
+        if days < 0:
+            raise ValueError(f"시작일이 종료일보다 늦습니다: {start} ~ {end}")
+        if max_days is not None and days + 1 > max_days:
+            raise ValueError(f"기간은 최대 {max_days}일까지 가능합니다: {start} ~ {end}")
+        return [(start_date + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days + 1)]
@@ -0,0 +1,212 @@
+"""
+실행 단위 프로파일링 모듈 (선택 기능)
+
+RunProfiler로 감싼 구간을 프로파일링하여 PROFILE_DIR/<시각>-<이름>/ 아래에 저장합니다.
+    cpu.folded       샘플링 프로파일러의 collapsed stack (flamegraph.pl, speedscope 등에 바로 입력)
+    cpu.pstats       cProfile 결과 (python -m pstats, snakeviz 등으로 열기)
+    cpu_top.txt      cProfile 누적 시간 상위 함수
+    allocations.txt  tracemalloc 할당 위치 상위 목록과 최대 사용량
+    summary.json     실행 시간, 샘플 수, 메모리 최대값 등 요약
+
+PROFILE_MODE가 sample이면 샘플링만, deterministic이면 cProfile만, both이면 둘 다 사용합니다.
+tracemalloc은 항상 함께 실행됩니다. 샘플링은 모든 스레드(iter_menus의 작업 스레드 포함)를
+기록하지만, cProfile은 프로파일링을 시작한 스레드만 측정합니다.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+from config import PROFILE_DIR, PROFILE_MODE, PROFILE_SAMPLE_INTERVAL
+
+PROFILE_MODES = ('sample', 'deterministic', 'both')
+# tracemalloc이 할당마다 저장할 호출 스택 깊이
+TRACEMALLOC_FRAMES = 10
+# allocations.txt에 기록할 할당 위치 수
+TOP_ALLOCATIONS = 25
+# cpu_top.txt에 기록할 함수 수
+TOP_FUNCTIONS = 40
+
+# 'Thread-12 (target)', 'ThreadPoolExecutor-0_3', 'menu-fetch_1'처럼 스레드마다 다른 번호를 지워
+# 같은 종류의 스레드를 합침
+_THREAD_NUMBER = re.compile(r"[-_]\d+")
+
+# 동시에 하나의 실행만 프로파일링 (main.py와 MenuFetcher가 둘 다 켜져도 바깥 구간만 기록)
+_active_lock = threading.Lock()
+
+
+class StackSampler:
+    """
+    sys._current_frames()로 모든 스레드의 호출 스택을 주기적으로 수집하는 샘플링 프로파일러
+    결과는 '스레드;바깥 함수;...;안쪽 함수 횟수' 형식의 collapsed stack입니다.
+    """
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_label(code) -> str:
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: _THREAD_NUMBER.sub("", t.name) for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                stack.reverse()
+                self.counts[";".join(stack)] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_folded(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    """
+    with 문으로 감싼 구간을 프로파일링하고 결과를 파일로 저장하는 컨텍스트 관리자
+
+    이미 다른 구간을 프로파일링 중이면 아무것도 하지 않습니다 (active가 False).
+    예외로 끝나도 (sys.exit 포함) 결과는 저장됩니다.
+    """
+
+    def __init__(self, name: str, directory: str = PROFILE_DIR, mode: str = PROFILE_MODE):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"알 수 없는 프로파일링 모드입니다: {mode}")
+        self.name = re.sub(r"[^\w.-]+", "_", name)
+        self.directory = directory
+        self.mode = mode
+        self.active = False
+        self.output_dir: Optional[str] = None
+        self._sampler: Optional[StackSampler] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._started_tracemalloc = False
+        self._started = 0.0
+
+    def __enter__(self) -> "RunProfiler":
+        if not _active_lock.acquire(blocking=False):
+            return self
+        self.active = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        else:
+            tracemalloc.reset_peak()
+        if self.mode in ('sample', 'both'):
+            self._sampler = StackSampler()
+            self._sampler.start()
+        self._started = time.perf_counter()
+        if self.mode in ('deterministic', 'both'):
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.active:
+            return
+        try:
+            if self._profiler is not None:
+                self._profiler.disable()
+            elapsed = time.perf_counter() - self._started
+            if self._sampler is not None:
+                self._sampler.stop()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            self._write(elapsed, snapshot, current, peak, exc_type)
+        except OSError as e:
+            print(f"⚠️  프로파일 저장 실패 (무시): {e}")
+        finally:
+            self.active = False
+            _active_lock.release()
+
+    def _write(self, elapsed: float, snapshot: tracemalloc.Snapshot, current: int, peak: int, exc_type):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.output_dir = os.path.join(self.directory, f"{stamp}-{self.name}-{os.getpid()}")
+        os.makedirs(self.output_dir, exist_ok=True)
+        files: List[str] = []
+
+        if self._sampler is not None:
+            self._sampler.write_folded(os.path.join(self.output_dir, "cpu.folded"))
+            files.append("cpu.folded")
+
+        if self._profiler is not None:
+            self._profiler.dump_stats(os.path.join(self.output_dir, "cpu.pstats"))
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            with open(os.path.join(self.output_dir, "cpu_top.txt"), "w", encoding="utf-8") as f:
+                f.write(out.getvalue())
+            files.extend(["cpu.pstats", "cpu_top.txt"])
+
+        top_allocations = self._write_allocations(snapshot, current, peak)
+        files.append("allocations.txt")
+
+        summary: Dict[str, any] = {
+            'name': self.name,
+            'mode': self.mode,
+            'elapsed_s': elapsed,
+            'status': 'ok' if exc_type is None else exc_type.__name__,
+            'samples': self._sampler.samples if self._sampler is not None else 0,
+            'sample_interval_s': self._sampler.interval if self._sampler is not None else None,
+            'tracemalloc_current_mb': current / (1024 * 1024),
+            'tracemalloc_peak_mb': peak / (1024 * 1024),
+            'top_allocations': top_allocations[:5],
+            'files': files + ["summary.json"],
+        }
+        with open(os.path.join(self.output_dir, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        print(f"🔬 프로파일 저장: {self.output_dir} "
+              f"({elapsed:.2f}초, 샘플 {summary['samples']}개, 최대 할당 {summary['tracemalloc_peak_mb']:.1f}MB)")
+
+    def _write_allocations(self, snapshot: tracemalloc.Snapshot, current: int, peak: int) -> List[str]:
+        """할당 위치 상위 목록을 allocations.txt에 쓰고, 요약용 한 줄 목록을 반환합니다."""
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        by_line = snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+        by_traceback = snapshot.statistics("traceback")[:5]
+        lines = [f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+                 f"{stat.size / 1024:.1f} KiB ({stat.count}회)" for stat in by_line]
+
+        with open(os.path.join(self.output_dir, "allocations.txt"), "w", encoding="utf-8") as f:
+            f.write(f"# 종료 시점 사용량 {current / 1024:.1f} KiB, 최대 {peak / 1024:.1f} KiB\n")
+            f.write(f"\n## 할당 위치 상위 {len(by_line)}개 (종료 시점까지 남아 있는 메모리)\n")
+            f.writelines(line + "\n" for line in lines)
+            f.write(f"\n## 호출 스택별 상위 {len(by_traceback)}개\n")
+            for stat in by_traceback:
+                f.write(f"\n{stat.size / 1024:.1f} KiB ({stat.count}회)\n")
+                f.writelines(f"  {line}\n" for line in stat.traceback.format())
+        return lines
@@ -0,0 +1,177 @@
+"""
+렌더링된 메뉴 메시지를 메뉴 데이터 옆에 저장해 두고 재사용하는 모듈
+
+캐시 키는 (메뉴 내용 + 렌더링 프로필 정의 + 렌더러 버전)의 해시이므로, 메뉴나 프로필이
+바뀌거나 렌더러 코드/규칙이 바뀌면 자동으로 새로 렌더링됩니다. 렌더러 버전에는
+format_menu_message, format_menu_blocks, RenderCache._render, MenuRules의 모든 메서드,
+식당/코스 이름 헬퍼의 바이트코드와 menu_rules.json 내용이 들어갑니다.
+같은 날짜·형식·프로필의 이전 결과는 새 결과를 저장할 때 삭제됩니다.
+"""
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+from types import CodeType
+from menu_fetcher import MenuFetcher, simplify_restaurant_name, clean_course_name
+from menu_rules import MenuRules
+from menu_store import MenuStore, write_json_atomic
+from config import MENU_RULES_PATH
+
+# 렌더러 버전의 코드 지문에 포함되지 않은 함수를 고쳐 렌더링 결과가 바뀔 때 직접 올림
+RENDERER_VERSION = "1"
+
+# Slack section 블록 텍스트 최대 길이
+BLOCK_TEXT_LIMIT = 3000
+MEAL_SEPARATOR = "\n----------------------------------------\n\n"
+
+# 전송 대상(채널)별 렌더링 프로필: 표시할 식사 목록
+RENDER_PROFILES: Dict[str, Dict[str, any]] = {
+    'default': {'meals': ['breakfast', 'lunch', 'dinner']},
+    'lunch': {'meals': ['lunch']},
+}
+
+
+def _code_fingerprint(code: CodeType) -> bytes:
+    """바이트코드와 상수로 만든 지문 (코드가 바뀌면 달라지고, 실행할 때마다 같음)"""
+    parts = [code.co_code, repr(code.co_names).encode("utf-8")]
+    for const in code.co_consts:
+        # 중첩 함수/람다는 repr에 메모리 주소가 들어가므로 재귀적으로 처리
+        parts.append(_code_fingerprint(const) if isinstance(const, CodeType) else repr(const).encode("utf-8"))
+    return b"\0".join(parts)
+
+
+def _class_fingerprint(cls: type) -> bytes:
+    """클래스에 정의된 모든 함수(메서드, classmethod, staticmethod)의 지문"""
+    parts = []
+    for name, attr in sorted(vars(cls).items()):
+        func = attr.__func__ if isinstance(attr, (classmethod, staticmethod)) else attr
+        code = getattr(func, "__code__", None)
+        if code is not None:
+            parts.append(name.encode("utf-8") + b"=" + _code_fingerprint(code))
+    return b"\0".join(parts)
+
+
+def _file_fingerprint(path: str) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return b""
+
+
+def format_menu_blocks(text: str) -> List[Dict[str, any]]:
+    """
+    텍스트 메시지를 Slack Block Kit 블록으로 변환합니다.
+    식사별로 section 블록을 만들고 사이에 divider를 넣습니다.
+    """
+    blocks = []
+    for chunk in text.split(MEAL_SEPARATOR):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        if blocks:
+            blocks.append({'type': 'divider'})
+        # section 텍스트 길이 제한을 넘으면 줄 단위로 나눔
+        while chunk:
+            if len(chunk) <= BLOCK_TEXT_LIMIT:
+                part, chunk = chunk, ""
+            else:
+                cut = chunk.rfind("\n", 0, BLOCK_TEXT_LIMIT)
+                cut = cut if cut > 0 else BLOCK_TEXT_LIMIT
+                part, chunk = chunk[:cut], chunk[cut:].lstrip("\n")
+            blocks.append({'type': 'section', 'text': {'type': 'mrkdwn', 'text': part}})
+    return blocks
+
+
+class RenderCache:
+    """
+    (날짜, 형식, 프로필)별 렌더링 결과 캐시
+
+    형식:
+        text:   format_menu_message 결과 (str)
+        blocks: Slack Block Kit 블록 목록 (list)
+    """
+
+    FORMATS = ('text', 'blocks')
+
+    def __init__(self, store: Optional[MenuStore] = None, fetcher: Optional[MenuFetcher] = None):
+        self.store = store or MenuStore()
+        self.fetcher = fetcher or MenuFetcher()
+        self.render_dir = os.path.join(self.store.directory, "renders")
+        self.renderer_version = hashlib.sha256(b"\0".join([
+            RENDERER_VERSION.encode("utf-8"),
+            _code_fingerprint(MenuFetcher.format_menu_message.__code__),
+            _code_fingerprint(format_menu_blocks.__code__),
+            _code_fingerprint(RenderCache._render.__code__),
+            _code_fingerprint(simplify_restaurant_name.__code__),
+            _code_fingerprint(clean_course_name.__code__),
+            _class_fingerprint(MenuRules),
+            _file_fingerprint(MENU_RULES_PATH),
+        ])).hexdigest()[:12]
+        self._memory: Dict[str, any] = {}
+        self._lock = threading.Lock()
+
+    def content_key(self, menu_data: Dict[str, any], profile: str = 'default') -> str:
+        """메뉴 내용, 렌더링 프로필 정의, 렌더러 버전으로 만든 캐시 키"""
+        canonical = json.dumps([menu_data, RENDER_PROFILES[profile]], ensure_ascii=False,
+                               sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256((self.renderer_version + canonical).encode("utf-8")).hexdigest()[:16]
+
+    def _path(self, date_str: str, fmt: str, profile: str, key: str) -> str:
+        return os.path.join(self.render_dir, date_str, f"{profile}.{fmt}.{key}.json")
+
+    def _render(self, menu_data: Dict[str, any], fmt: str, profile: str):
+        meals = RENDER_PROFILES[profile]['meals']
+        view = {'date': menu_data['date']}
+        view.update({meal: menu_data.get(meal) for meal in meals})
+        text = self.fetcher.format_menu_message(view)
+        return text if fmt == 'text' else format_menu_blocks(text)
+
+    def render(self, menu_data: Dict[str, any], fmt: str = 'text', profile: str = 'default'):
+        """
+        렌더링 결과를 반환합니다. 캐시에 있으면 읽기만 하고, 없으면 렌더링 후 저장합니다.
+
+        Args:
+            menu_data: 메뉴 정보 딕셔너리
+            fmt: 'text' 또는 'blocks'
+            profile: RENDER_PROFILES의 프로필 이름
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+        if profile not in RENDER_PROFILES:
+            raise ValueError(f"알 수 없는 렌더링 프로필입니다: {profile}")
+
+        date_str = menu_data['date']
+        path = self._path(date_str, fmt, profile, self.content_key(menu_data, profile))
+        rendered = self._memory.get(path)
+        if rendered is not None:
+            return rendered
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                rendered = json.load(f)
+        except (OSError, ValueError):
+            rendered = self._render(menu_data, fmt, profile)
+            self._save(path, rendered)
+
+        with self._lock:
+            self._memory[path] = rendered
+        return rendered
+
+    def _save(self, path: str, rendered):
+        """결과를 저장하고 같은 날짜·형식·프로필의 오래된 결과를 삭제합니다."""
+        directory = os.path.dirname(path)
+        prefix = os.path.basename(path).rsplit(".", 2)[0]
+        try:
+            for old in glob.glob(os.path.join(glob.escape(directory), glob.escape(prefix) + ".*.json")):
+                if old != path:
+                    try:
+                        os.remove(old)
+                    except FileNotFoundError:
+                        pass  # 다른 프로세스가 이미 삭제한 경우
+                    self._memory.pop(old, None)
+            write_json_atomic(path, rendered)
+        except OSError as e:
+            print(f"⚠️  렌더링 캐시 저장 실패 (무시): {e}")
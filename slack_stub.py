@@ -0,0 +1,59 @@
+"""
+Slack Incoming Webhook을 흉내 내는 로컬 HTTP 서버
+벤치마크나 CI에서 실제 Slack에 보내지 않고 전체 파이프라인을 실행할 때 사용합니다.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+class StubWebhookServer:
+    """
+    127.0.0.1의 임의 포트에서 POST를 받아 'ok'로 응답하는 Webhook 대역
+
+    with 문으로 사용하면 백그라운드 스레드에서 실행되고 종료 시 정리됩니다.
+    keep_payloads가 True이면 받은 페이로드를 payloads에 보관합니다.
+    """
+
+    def __init__(self, keep_payloads: bool = False):
+        self.keep_payloads = keep_payloads
+        self.payloads: List[Dict[str, any]] = []
+        self.received = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub._lock:
+                    stub.received += 1
+                    if stub.keep_payloads:
+                        stub.payloads.append(json.loads(body or b"{}"))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/services/STUB/STUB/STUB"
+
+    def __enter__(self) -> "StubWebhookServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
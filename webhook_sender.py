@@ -4,19 +4,27 @@ Slack Webhook을 통해 메시지를 전송하는 모듈
 import json
 import requests
 from datetime import datetime
-from typing import Dict, Optional
-from config import SLACK_WEBHOOK_URL
+from typing import Dict, Iterable, List, Optional, Union
+from config import SLACK_WEBHOOK_URL, SLACK_MESSAGE_FORMAT, SLACK_RENDER_PROFILE
 from menu_fetcher import MenuFetcher
+from menu_store import is_sample_menu
+from render_cache import RenderCache
 
 
 class WebhookSender:
     """Slack Webhook 메시지 전송 클래스"""
     
-    def __init__(self, webhook_url: Optional[str] = None):
+    def __init__(self, webhook_url: Optional[str] = None, message_format: Optional[str] = None,
+                 profile: Optional[str] = None, menu_fetcher: Optional[MenuFetcher] = None,
+                 dry_run: bool = False):
         self.webhook_url = webhook_url or SLACK_WEBHOOK_URL
-        if not self.webhook_url:
+        self.dry_run = dry_run
+        if not self.webhook_url and not dry_run:
             raise ValueError("SLACK_WEBHOOK_URL이 설정되지 않았습니다.")
-        self.menu_fetcher = MenuFetcher()
+        self.message_format = message_format or SLACK_MESSAGE_FORMAT
+        self.profile = profile or SLACK_RENDER_PROFILE
+        self.menu_fetcher = menu_fetcher or MenuFetcher()
+        self.render_cache = RenderCache(self.menu_fetcher.store, self.menu_fetcher)
     
     def send_today_menu(self) -> bool:
         """
@@ -27,16 +35,57 @@ class WebhookSender:
         """
         try:
             menu_data = self.menu_fetcher.get_today_menu()
-            message = self._format_webhook_message(menu_data)
-            return self._send_message(message)
+            return self._send_menu(menu_data)
         except Exception as e:
             print(f"메뉴 전송 중 오류 발생: {e}")
             return False
     
+    def send_menus(self, dates: Iterable[Union[datetime, str]], archive: bool = True) -> Dict[str, bool]:
+        """
+        여러 날짜의 메뉴를 크롤링되는 순서대로 바로 전송합니다.
+        첫 날짜의 메시지는 나머지 날짜를 가져오는 동안 먼저 전송됩니다.
+        
+        Args:
+            dates: 날짜 객체 또는 'YYYY-MM-DD' 문자열 목록
+            archive: 가져온 메뉴 중 저장소에 아직 없는 것을 기록할지 여부 (샘플 데이터는 제외)
+            
+        Returns:
+            Dict: 날짜별 전송 성공 여부
+        """
+        results = self.menu_fetcher.iter_menus(dates)
+        if archive:
+            results = self.menu_fetcher.store.archive(results)
+        
+        sent = {}
+        for result in results:
+            if result['error']:
+                print(f"❌ {result['date']} 메뉴를 가져오지 못했습니다: {result['error']['message']}")
+                sent[result['date']] = False
+                continue
+            sent[result['date']] = self._send_menu(result['menu'])
+        return sent
+    
+    def _send_menu(self, menu_data: Dict[str, any]) -> bool:
+        """
+        메뉴를 설정된 형식/프로필로 렌더링(캐시 사용)하여 전송합니다.
+        API/웹사이트 URL이 설정되어 있는데 샘플 메뉴가 돌아왔다면 (가져오기 실패)
+        만들어 낸 메뉴를 실제 메뉴처럼 보내지 않도록 전송하지 않습니다 (--source sample은 예외).
+        """
+        fetcher = self.menu_fetcher
+        if is_sample_menu(menu_data) and fetcher.source != 'sample' and (fetcher.api_url or fetcher.website_url):
+            print(f"❌ {menu_data['date']} 실제 메뉴를 가져오지 못해 샘플 메뉴는 전송하지 않습니다.")
+            return False
+        text = self._format_webhook_message(menu_data)
+        blocks = None
+        if self.message_format == "blocks":
+            blocks = self.render_cache.render(menu_data, 'blocks', self.profile)
+        return self._send_message(text, blocks)
+    
     def _format_webhook_message(self, menu_data: Dict[str, any]) -> str:
         """
         Webhook용 메시지를 포맷팅합니다.
         menu_fetcher의 format_menu_message를 사용하여 일관된 포맷 유지.
+        같은 메뉴는 렌더링 캐시에서 읽어오므로 재시도나 추가 채널 전송 시 다시 렌더링하지 않습니다.
         
         Args:
             menu_data: 메뉴 정보 딕셔너리
@@ -44,15 +93,15 @@ class WebhookSender:
         Returns:
             str: 포맷팅된 메시지
         """
-        # menu_fetcher의 포맷팅 메서드 재사용
-        return self.menu_fetcher.format_menu_message(menu_data)
+        return self.render_cache.render(menu_data, 'text', self.profile)
     
-    def _send_message(self, text: str) -> bool:
+    def _send_message(self, text: str, blocks: Optional[List[Dict[str, any]]] = None) -> bool:
         """
         Slack Webhook으로 메시지를 전송합니다.
         
         Args:
-            text: 전송할 메시지 텍스트
+            text: 전송할 메시지 텍스트 (blocks가 있으면 알림용 대체 텍스트)
+            blocks: Block Kit 블록 목록
             
         Returns:
             bool: 전송 성공 여부
@@ -61,6 +110,14 @@ class WebhookSender:
             payload = {
                 "text": text
             }
+            if blocks:
+                payload["blocks"] = blocks
+            
+            # dry-run: 전송하지 않고 보낼 내용만 출력
+            if self.dry_run:
+                print(json.dumps(payload, ensure_ascii=False, indent=2))
+                print("🧪 dry-run: Slack으로 전송하지 않았습니다.")
+                return True
             
             response = requests.post(
                 self.webhook_url,